@@ -1,376 +1,371 @@
 import os
-import shutil
 import sys
-from datetime import datetime
+import time
+
+# Startup timing trace, printed to stderr on first paint when JAMES_STARTUP_TRACE is set
+STARTUP_TRACE_ENV = "JAMES_STARTUP_TRACE"
+_startup_marks = [("start", time.perf_counter())]
+
+def mark_startup(label):
+    if os.environ.get(STARTUP_TRACE_ENV):
+        _startup_marks.append((label, time.perf_counter()))
+
+def print_startup_trace():
+    if not os.environ.get(STARTUP_TRACE_ENV):
+        return
+    started = previous = _startup_marks[0][1]
+    for label, moment in _startup_marks[1:]:
+        print(f"[startup] {label:<32} +{(moment - previous) * 1000:8.1f} ms  ({(moment - started) * 1000:8.1f} ms total)",
+              file=sys.stderr)
+        previous = moment
+
+from james_core import (
+    BATCH_PROJECT_WORKERS, FOLDER_CREATION_WORKERS, MOVED_REPORT_NAME, FolderWatcher, ProgressChannel,
+    ProjectInventory, ReportReader, RunMetrics, async_io_limit, create_folder_structure, describe_metrics,
+    find_move_journals, language_registry, load_manifest, methodology_names, methodology_template_errors,
+    metrics_enabled, open_async_filesystem, parse_languages, preview_empty_folder_deletion, preview_folder_creation,
+    process_empty_folder_deletion_logic, provision_projects, read_creation_state, read_move_journal,
+    restore_obsolete_moves
+)
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Headless mode (James.py create|clean ...): dispatch before PySide6 is ever imported
+    from james_cli import main as cli_main
+    sys.exit(cli_main(sys.argv[1:]))
 
 # Import PySide6 modules
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget,
     QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QListWidget, QProgressBar, QFileDialog,
-    QMessageBox, QAbstractItemView, QSizePolicy
+    QMessageBox, QAbstractItemView, QSizePolicy, QCheckBox, QCompleter, QTableWidget, QTableWidgetItem,
+    QHeaderView, QTableView, QDialog
 )
-from PySide6.QtCore import Qt, QSize, QThread, Signal, QPoint, QRect
+from PySide6.QtCore import Qt, QSize, QThread, QTimer, Signal, QPoint, QRect, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QMouseEvent, QFont, QIcon
 
-# --- Script 1: Folder Creation Functions (Adapted for PySide6 UI Interactions) ---
-def create_directory(path):
-    """Creates a directory if it doesn't exist."""
-    os.makedirs(path, exist_ok=True)
-
-def get_language_code_med_devices(language):
-    """Extracts the first two lowercase and last two uppercase letters of a language."""
-    if len(language) >= 4:
-        return f"{language[:2].lower()}{language[-2:].upper()}"
-    elif len(language) == 3:
-        return f"{language[:2].lower()}{language[-1:].upper()}"
-    elif len(language) == 2:
-        return f"{language.lower()}{language.upper()}"
-    else:
-        return "xxXX" # Default if language code is too short
-
-def get_current_date_code():
-    """Returns the current date inYYYY-MM-DD format."""
-    return datetime.now().strftime("%Y-%m-%d")
+mark_startup("import")
 
+# --- PySide6 Helpers ---
 def browse_folder_pyside(entry_widget: QLineEdit):
     """Opens a QFileDialog for the user to select a folder and updates the QLineEdit."""
     folder_selected = QFileDialog.getExistingDirectory(None, "Select Folder", "", QFileDialog.ShowDirsOnly)
     if folder_selected:
         entry_widget.setText(folder_selected)
 
-# --- Methodology Specific Folder Creation Functions ---
-def create_base_folders(path):
-    """Creates the base 'Work' folder and initial subfolders (for non-Med_Devices)."""
-    try:
-        work_path = os.path.join(path, "Work")
-        create_directory(work_path)
-        create_directory(os.path.join(work_path, "01_Source"))
-        prep_path = os.path.join(work_path, "02_Prep")
-        create_directory(prep_path)
-        create_directory(os.path.join(prep_path, "01_toDTP-ENG"))
-        create_directory(os.path.join(prep_path, "02_fromDTP-ENG"))
-        create_directory(os.path.join(prep_path, "03_SegQA"))
-        create_directory(os.path.join(work_path, "03_Mapping"))
-        create_directory(os.path.join(work_path, "04_Mapping_Review"))
-        legacy_analysis_path = os.path.join(work_path, "05_Legacy_Analysis")
-        create_directory(legacy_analysis_path)
-        create_directory(os.path.join(legacy_analysis_path, "01_toCleanUp"))
-        create_directory(os.path.join(legacy_analysis_path, "02_CleanedUp"))
-        create_directory(os.path.join(legacy_analysis_path, "03_TMX-Create"))
-        target_path = os.path.join(work_path, "06_Target")
-        create_directory(target_path)
-        return target_path
-    except Exception as e:
-        raise e
-
-def create_language_folders_adapt(languages, path, progress_callback):
-    """Creates 'Adapt' methodology specific folders."""
-    try:
-        target_path = create_base_folders(path)
-        if target_path:
-            for language in languages:
-                language_path = os.path.join(target_path, language)
-                create_directory(language_path)
-                adapt_path = os.path.join(language_path, "Adapt")
-                create_directory(adapt_path)
-                adapt_subfolders = ["01_Adapt", "02_LLQA", "03_Post", "04_Final_QA", "05_Final_PM", "06_TM_Update"]
-                for subfolder in adapt_subfolders:
-                    create_directory(os.path.join(adapt_path, subfolder))
-                create_directory(os.path.join(adapt_path, "01_Adapt", "01_toLing"))
-                create_directory(os.path.join(adapt_path, "01_Adapt", "02_fromLing"))
-                create_directory(os.path.join(adapt_path, "03_Post", "01_toPost"))
-                create_directory(os.path.join(adapt_path, "03_Post", "02_fromPost"))
-                progress_callback.emit(1)
-    except Exception as e:
-        raise e
-
-def create_language_folders_TEP(languages, path, progress_callback):
-    """Creates 'TEP' methodology specific folders."""
-    try:
-        target_path = create_base_folders(path)
-        if target_path:
-            for language in languages:
-                language_path = os.path.join(target_path, language)
-                create_directory(language_path)
-                tep_path = os.path.join(language_path, "TEP")
-                create_directory(tep_path)
-                main_folders = ["01_Trans", "02_Edit", "03_LLQA", "05_Post", "06_Final_QA", "07_Final_PM", "08_TM_Update"]
-                for folder in main_folders:
-                    create_directory(os.path.join(tep_path, folder))
-                create_directory(os.path.join(tep_path, "01_Trans", "01_toLing"))
-                create_directory(os.path.join(tep_path, "01_Trans", "02_fromLing"))
-                create_directory(os.path.join(tep_path, "02_Edit", "01_toLing"))
-                create_directory(os.path.join(tep_path, "02_Edit", "02_fromLing"))
-                create_directory(os.path.join(tep_path, "05_Post", "01_toPost"))
-                create_directory(os.path.join(tep_path, "05_Post", "02_fromPost"))
-                progress_callback.emit(1)
-    except Exception as e:
-        raise e
-
-def create_language_folders_lv(languages, path, progress_callback):
-    """Creates 'LV' methodology specific folders."""
-    try:
-        target_path = create_base_folders(path)
-        if target_path:
-            subfolders_with_nested_structure = {
-                "01a_FT1", "01b_FT2", "02_Rec1", "03_BT", "04_CR",
-                "05_Rec2", "06_SME_Review", "07_Rec3", "09_LSO", "10_CogDeb", "11_Rec4"
-            }
-            for i, language in enumerate(languages):
-                language_path = os.path.join(target_path, language)
-                create_directory(language_path)
-                lv_path = os.path.join(language_path, "LV")
-                create_directory(lv_path)
-                lv_subfolders = [
-                    "01a_FT1", "01b_FT2", "02_Rec1", "03_BT", "04_CR",
-                    "05_Rec2", "06_SME_Review", "07_Rec3", "08_Post", "09_LSO",
-                    "10_CogDeb", "11_Rec4", "12_Final_QA", "13_Final_PM", "14_TM_Update"
-                ]
-                for subfolder in lv_subfolders:
-                    subfolder_path = os.path.join(lv_path, subfolder)
-                    create_directory(subfolder_path)
-                    if subfolder in subfolders_with_nested_structure:
-                        create_directory(os.path.join(subfolder_path, "01_toLing"))
-                        create_directory(os.path.join(subfolder_path, "02_fromLing"))
-                        create_directory(os.path.join(subfolder_path, "03_LLQA"))
-                progress_callback.emit(1)
-    except Exception as e:
-        raise e
-
-def create_language_folders_ftbt(languages, path, progress_callback):
-    """Creates 'FTBT' methodology specific folders."""
-    try:
-        target_path = create_base_folders(path)
-        if target_path:
-            for language in languages:
-                language_path = os.path.join(target_path, language)
-                create_directory(language_path)
-                ftbt_path = os.path.join(language_path, "FTBT")
-                create_directory(ftbt_path)
-                ftbt_subfolders = ["01_FT", "02_BT", "03_CR", "04_CRI", "05_Post", "06_LSO", "07_Final_QA", "08_Final_PM", "09_TM_Update"]
-                target_inner_subfolders = ["01_FT", "02_BT", "03_CR", "04_CRI", "06_LSO"]
-                for subfolder in ftbt_subfolders:
-                    subfolder_path = os.path.join(ftbt_path, subfolder)
-                    create_directory(subfolder_path)
-                    if subfolder in target_inner_subfolders:
-                        create_directory(os.path.join(subfolder_path, "01_toLing"))
-                        create_directory(os.path.join(subfolder_path, "02_fromLing"))
-                        create_directory(os.path.join(subfolder_path, "03_LLQA"))
-                progress_callback.emit(1)
-    except Exception as e:
-        raise e
-
-def create_language_folders_migration(languages, path, progress_callback):
-    """Creates 'Migration' methodology specific folders."""
-    try:
-        target_path = create_base_folders(path)
-        if target_path:
-            for language in languages:
-                language_path = os.path.join(target_path, language)
-                create_directory(language_path)
-                migration_path = os.path.join(language_path, "Migration")
-                create_directory(migration_path)
-                migration_subfolders = ["01_Mig", "02_MigQA", "03_Post", "04_SSR1", "05_SSR2", "06_SSR3", "x_Approved"]
-                for subfolder in migration_subfolders:
-                    subfolder_path = os.path.join(migration_path, subfolder)
-                    create_directory(subfolder_path)
-                    if subfolder in ["01_Mig", "02_MigQA", "04_SSR1", "05_SSR2", "06_SSR3"]:
-                        create_directory(os.path.join(subfolder_path, "01_toLing"))
-                        create_directory(os.path.join(subfolder_path, "02_fromLing"))
-                        create_directory(os.path.join(subfolder_path, "03_LLQA"))
-                progress_callback.emit(1)
-    except Exception as e:
-        raise e
-
-def create_language_folders_flv(languages, path, progress_callback):
-    """Creates 'FLV' methodology specific folders."""
-    try:
-        target_path = create_base_folders(path)
-        if target_path:
-            for language in languages:
-                language_path = os.path.join(target_path, language)
-                create_directory(language_path)
-                flv_path = os.path.join(language_path, "FLV")
-                create_directory(flv_path)
-                flv_subfolders = ["01a_FT1", "01b_FT2", "02_Rec1", "03_BT", "04_CR", "05_Rec2", "06_Expert_Review", "07_Rec3", "08_SME_Review", "09_Rec4", "10_Post"]
-                for subfolder in flv_subfolders:
-                    subfolder_path = os.path.join(flv_path, subfolder)
-                    create_directory(subfolder_path)
-                    if subfolder in ["01a_FT1", "01b_FT2", "02_Rec1", "03_BT", "04_CR", "05_Rec2", "06_Expert_Review", "07_Rec3", "08_SME_Review", "09_Rec4"]:
-                        create_directory(os.path.join(subfolder_path, "01_toLing"))
-                        create_directory(os.path.join(subfolder_path, "02_fromLing"))
-                        create_directory(os.path.join(subfolder_path, "03_LLQA"))
-                progress_callback.emit(1)
-    except Exception as e:
-        raise e
-
-def create_language_folders_med_devices(languages, path, progress_callback):
-    """Creates 'Med_Devices' methodology specific folders."""
-    try:
-        work_path = os.path.join(path, "Work")
-        create_directory(work_path)
-
-        for language in languages:
-            lang_code = get_language_code_med_devices(language)
-            date_code = get_current_date_code()
-
-            create_directory(os.path.join(work_path, "01_Source",f"{date_code}_{lang_code}", language))
-            create_directory(os.path.join(work_path, "02_Prep", f"{date_code}_{lang_code}", language))
-            create_directory(os.path.join(work_path, "03_Trans", f"{date_code}_{lang_code}", language))
-            create_directory(os.path.join(work_path, "04_Revision", f"{date_code}_{lang_code}", language))
-            create_directory(os.path.join(work_path, "05_Post", f"{date_code}_{lang_code}", language))
-            create_directory(os.path.join(work_path, "06_Final_QA", f"{date_code}_{lang_code}", language))
-            create_directory(os.path.join(work_path, "07_Final_PM", f"{date_code}_{lang_code}", language))
-            create_directory(os.path.join(work_path, "xx_ICR", f"{date_code}_{lang_code}", language))
-            create_directory(os.path.join(work_path, "xx_ICR_imp", f"{date_code}_{lang_code}", language))
-
-            progress_callback.emit(1)
-    except Exception as e:
-        raise e
-
-def create_language_folders_cogdeb(languages, path, progress_callback):
-    """Creates 'CogDeb' methodology specific folders."""
-    try:
-        target_path = create_base_folders(path)
-        if target_path:
-            for language in languages:
-                language_path = os.path.join(target_path, language)
-                create_directory(language_path)
-                cogdeb_path = os.path.join(language_path, "CogDeb")
-                create_directory(cogdeb_path)
-                cogdeb_subfolders = ["01a_FT1", "01b_FT2", "02_Rec1", "03_BT", "04_CR", "05_Rec2", "06_Post", "07_LSO", "08_CogDeb", "09_Rec4", "10_Final_QA", "11_Final_PM", "12_TM_Update"]
-                target_inner_cogdeb_subfolders = ["01a_FT1", "01b_FT2", "02_Rec1", "03_BT", "04_CR", "05_Rec2", "07_LSO", "08_CogDeb", "09_Rec4"]
-                for subfolder in cogdeb_subfolders:
-                    subfolder_path = os.path.join(cogdeb_path, subfolder)
-                    create_directory(subfolder_path)
-                    if subfolder in target_inner_cogdeb_subfolders:
-                        create_directory(os.path.join(subfolder_path, "01_toLing"))
-                        create_directory(os.path.join(subfolder_path, "02_fromLing"))
-                        create_directory(os.path.join(subfolder_path, "03_LLQA"))
-                progress_callback.emit(1)
-    except Exception as e:
-        raise e
+class LanguageCompleter(QCompleter):
+    """Completes the entry after the last comma of a comma separated languages QLineEdit."""
+
+    def __init__(self, suggestions, parent=None):
+        super().__init__(suggestions, parent)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterMode(Qt.MatchContains)
 
+    def splitPath(self, path):
+        return [path.rsplit(",", 1)[-1].strip()]
+
+    def pathFromIndex(self, index):
+        completion = super().pathFromIndex(index)
+        head, comma, _ = self.widget().text().rpartition(",")
+        return f"{head}, {completion}" if comma else completion
+
+class ReportTableModel(QAbstractTableModel):
+    """Table over a ReportReader: rows are indexed a batch at a time as the view scrolls down."""
+    COLUMNS = ("Status", "Path", "Duration", "Error")
+    rows_fetched = Signal(int, bool) # rows so far, whole report read
+
+    def __init__(self, reader, parent=None):
+        super().__init__(parent)
+        self.reader = reader
+        self.row_count = 0
+        self.fetch_scheduled = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        entry = self.reader.row(index.row())
+        column = index.column()
+        if column == 0:
+            return entry.get("status", "")
+        if column == 1:
+            return entry.get("path", "")
+        if column == 2:
+            duration = entry.get("duration")
+            return f"{duration * 1000:.1f} ms" if duration is not None else ""
+        return entry.get("error", "")
+
+    def canFetchMore(self, parent=QModelIndex()):
+        # poll() picks up entries a still running cleanup appended after the end was reached
+        return not parent.isValid() and self.reader.poll()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.reader.at_end:
+            return
+        added = self.reader.fetch()
+        if added:
+            self.beginInsertRows(QModelIndex(), self.row_count, self.row_count + added - 1)
+            self.row_count += added
+            self.endInsertRows()
+        elif not self.reader.at_end and not self.fetch_scheduled:
+            # A selective filter matched nothing in this chunk; keep reading without blocking the UI
+            self.fetch_scheduled = True
+            QTimer.singleShot(0, self.fetch_next_chunk)
+        self.rows_fetched.emit(self.row_count, self.reader.at_end)
+
+    def fetch_next_chunk(self):
+        self.fetch_scheduled = False
+        self.fetchMore()
+
+class ReportViewerDialog(QDialog):
+    """Browses a JSONL report of any size, with failed/methodology/language filters."""
+
+    def __init__(self, jsonl_path, parent=None):
+        super().__init__(parent)
+        self.jsonl_path = jsonl_path
+        self.model = None
+        self.setWindowTitle(os.path.basename(jsonl_path))
+        self.resize(760, 520)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        filter_layout = QHBoxLayout()
+        self.failed_checkbox = QCheckBox("Failed only")
+        self.methodology_filter = QLineEdit()
+        self.methodology_filter.setPlaceholderText("Methodology folder, e.g. FLV")
+        self.language_filter = QLineEdit()
+        self.language_filter.setPlaceholderText("Language folder, e.g. de-DE")
+        filter_layout.addWidget(self.failed_checkbox)
+        filter_layout.addWidget(self.methodology_filter)
+        filter_layout.addWidget(self.language_filter)
+        layout.addLayout(filter_layout)
+
+        self.table_view = QTableView()
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.verticalHeader().setVisible(False)
+        # Fixed row heights and column widths: nothing is ever measured across all rows
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_view.verticalHeader().setDefaultSectionSize(22)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table_view)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        # Filters restart the lazy index; typing is debounced so each pause opens one reader
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(250)
+        self.filter_timer.timeout.connect(self.apply_filters)
+        self.failed_checkbox.toggled.connect(self.apply_filters)
+        self.methodology_filter.textChanged.connect(self.filter_timer.start)
+        self.language_filter.textChanged.connect(self.filter_timer.start)
+        # A report still being written keeps growing; once the end is shown, check for more each second
+        self.follow_timer = QTimer(self)
+        self.follow_timer.setInterval(1000)
+        self.follow_timer.timeout.connect(self.follow_report)
+        self.follow_timer.start()
+        self.apply_filters()
+
+    def apply_filters(self):
+        try:
+            reader = ReportReader(self.jsonl_path, status="failed" if self.failed_checkbox.isChecked() else None,
+                                  methodology=self.methodology_filter.text().strip() or None,
+                                  language=self.language_filter.text().strip() or None)
+        except OSError as e:
+            self.status_label.setText(f"The report could not be opened: {e}")
+            return
+        if self.model is not None:
+            self.model.reader.close()
+        self.model = ReportTableModel(reader, self)
+        self.model.rows_fetched.connect(self.on_rows_fetched)
+        self.table_view.setModel(self.model)
+        self.table_view.setColumnWidth(0, 70)
+        self.table_view.setColumnWidth(1, 460)
+        self.table_view.setColumnWidth(2, 80)
+        self.status_label.setText("Reading report...")
+        self.model.fetchMore()
+
+    def follow_report(self):
+        if self.model is not None and self.model.reader.at_end and self.model.reader.poll():
+            self.model.fetchMore()
+
+    def on_rows_fetched(self, rows, complete):
+        self.status_label.setText(f"{rows:,} entries" if complete else f"{rows:,} entries so far (scroll for more)")
+
+    def done(self, result):
+        if self.model is not None:
+            self.model.reader.close()
+        super().done(result)
 
 # --- QThread for Folder Creation ---
 class FolderCreationWorker(QThread):
-    progress_updated = Signal(int)
-    finished = Signal()
+    progress_updated = Signal(str, int, int, float) # stage, done, total, ETA in seconds (-1 if unknown)
+    finished = Signal(dict)
     error_occurred = Signal(str)
 
-    def __init__(self, languages_str: str, methodologies_list: list, path: str):
+    def __init__(self, languages_str: str, methodologies_list: list, path: str,
+                 max_workers: int = FOLDER_CREATION_WORKERS, skip_existing: bool = True, resume: bool = True):
         super().__init__()
         self.languages_str = languages_str
         self.methodologies_list = methodologies_list
         self.path = path
+        self.max_workers = max_workers
+        self.skip_existing = skip_existing
+        self.resume = resume
 
     def run(self):
         try:
-            parsed_languages = [lang.strip() for lang in self.languages_str.split(',') if lang.strip()]
+            parsed_languages = parse_languages(self.languages_str)
             if not parsed_languages:
                 self.error_occurred.emit("Languages input is invalid.")
                 return
 
-            for method in self.methodologies_list:
-                method_lower = method.lower()
-                if method_lower == "adapt":
-                    create_language_folders_adapt(parsed_languages, self.path, self.progress_updated)
-                elif method_lower == "tep":
-                    create_language_folders_TEP(parsed_languages, self.path, self.progress_updated)
-                elif method_lower == "lv":
-                    create_language_folders_lv(parsed_languages, self.path, self.progress_updated)
-                elif method_lower == "ftbt":
-                    create_language_folders_ftbt(parsed_languages, self.path, self.progress_updated)
-                elif method_lower == "migration":
-                    create_language_folders_migration(parsed_languages, self.path, self.progress_updated)
-                elif method_lower == "flv":
-                    create_language_folders_flv(parsed_languages, self.path, self.progress_updated)
-                elif method_lower == "med_devices":
-                    create_language_folders_med_devices(parsed_languages, self.path, self.progress_updated)
-                elif method_lower == "cogdeb":
-                    create_language_folders_cogdeb(parsed_languages, self.path, self.progress_updated)
-                else:
-                    self.error_occurred.emit(f"Unknown methodology: {method}")
-                    return
+            # Counted per folder in this thread, forwarded to the UI at most every ~50 ms
+            progress = ProgressChannel(self.progress_updated.emit)
+            progress.start_stage("Planning")
+            try:
+                with open_async_filesystem(async_io_limit()) as filesystem:
+                    result = create_folder_structure(self.path, parsed_languages, self.methodologies_list,
+                                                     progress, self.max_workers, self.skip_existing,
+                                                     lambda total: progress.start_stage("Creating", total),
+                                                     RunMetrics("folder_creation") if metrics_enabled() else None,
+                                                     self.resume, filesystem)
+            except ValueError as e:
+                self.error_occurred.emit(str(e))
+                return
+            except OSError as e:
+                self.error_occurred.emit(f"Folder creation stopped: {e}\n"
+                                         "Finished parts were saved; click Create again to resume.")
+                return
 
-            self.finished.emit()
+            progress.finish()
+            self.finished.emit(result)
         except Exception as e:
             self.error_occurred.emit(f"An unexpected error occurred: {e}")
 
 
-# --- Script 2: Empty Folder Deletion Functions (Adapted for PySide6 UI Interactions) ---
-def is_dir_empty(dirpath):
-    for _, dirnames, files in os.walk(dirpath):
-        if files or dirnames:
-            return False
-    return True
-
-def identify_empty_dirs(path):
-    empty_folders = []
-    for dirpath, dirnames, files in os.walk(path, topdown=False):
-        if "_Obsolete" not in dirpath:
-            if is_dir_empty(dirpath):
-                empty_folders.append(dirpath)
-    return empty_folders
-
-def move_empty_dirs(empty_folders, obsolete_dir):
-    moved_folders_info = []
-    for folder in empty_folders:
+# --- QThread for Empty Folder Deletion ---
+class EmptyFolderDeletionWorker(QThread):
+    progress_updated = Signal(str, int, int, float) # stage, done, total (0 while scanning), folders/s
+    finished = Signal(dict)
+    error_occurred = Signal(str)
+
+    def __init__(self, path: str, dry_run: bool = False, use_scan_cache: bool = False, force_rescan: bool = False,
+                 emptiness_index=None):
+        super().__init__()
+        self.path = path
+        self.dry_run = dry_run
+        self.use_scan_cache = use_scan_cache
+        self.force_rescan = force_rescan
+        self.emptiness_index = emptiness_index
+
+    def run(self):
         try:
-            common_base = os.path.commonpath([folder, obsolete_dir])
-            relative_path = os.path.relpath(folder, common_base)
-           
-            dest_folder = os.path.join(obsolete_dir, relative_path)
-            os.makedirs(os.path.dirname(dest_folder), exist_ok=True)
-            shutil.move(folder, dest_folder)
-            moved_folders_info.append(f"Moved: {folder} to {dest_folder}")
+            # JAMES_ASYNC_IO=N runs the filesystem calls on an asyncio loop inside this thread
+            with open_async_filesystem(async_io_limit()) as filesystem:
+                if self.dry_run:
+                    result = preview_empty_folder_deletion(self.path, self.progress_updated.emit, self.isInterruptionRequested,
+                                                           use_scan_cache=self.use_scan_cache and not self.force_rescan,
+                                                           emptiness_index=self.emptiness_index, filesystem=filesystem)
+                else:
+                    result = process_empty_folder_deletion_logic(self.path, self.progress_updated.emit, self.isInterruptionRequested,
+                                                                 jsonl_report=True, # Read by the results panel
+                                                                 use_scan_cache=self.use_scan_cache, force_rescan=self.force_rescan,
+                                                                 emptiness_index=self.emptiness_index,
+                                                                 metrics=RunMetrics("empty_folder_cleanup") if metrics_enabled() else None,
+                                                                 filesystem=filesystem)
+            self.finished.emit(result)
         except Exception as e:
-            moved_folders_info.append(f"Failed to move {folder}: {e}")
-    return moved_folders_info
+            self.error_occurred.emit(f"An error occurred during empty folder deletion: {e}")
 
-def process_empty_folder_deletion_logic(path_to_clean: str):
-    if not path_to_clean or not os.path.isdir(path_to_clean):
-        QMessageBox.warning(None, "Input Error", "Please enter a valid path to clean.")
-        return
 
-    obsolete_dir = os.path.join(path_to_clean, "_Obsolete")
-    os.makedirs(obsolete_dir, exist_ok=True)
+# --- QThread for the initial scan of a watched folder ---
+class WatchStartWorker(QThread):
+    finished = Signal(object) # the running FolderWatcher
+    error_occurred = Signal(str)
 
-    empty_folders_report = []
-    moved_folders_report = []
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
 
-    try:
-        while True:
-            current_empty_folders = identify_empty_dirs(path_to_clean)
-            if not current_empty_folders:
-                break
+    def run(self):
+        try:
+            self.finished.emit(FolderWatcher(self.path).start())
+        except Exception as e:
+            self.error_occurred.emit(f"Could not start watching the folder: {e}")
 
-            moved_info = move_empty_dirs(current_empty_folders, obsolete_dir)
-            empty_folders_report.extend(current_empty_folders)
-            moved_folders_report.extend(moved_info)
-           
-            if not moved_info and current_empty_folders:
-                break
 
-        if empty_folders_report:
-            report_file_path = os.path.join(path_to_clean, 'empty_folders_report.txt')
-            moved_report_file_path = os.path.join(path_to_clean, 'moved_folders_report.txt')
+# --- QThread for Restoring a Cleanup ---
+class RestoreWorker(QThread):
+    progress_updated = Signal(str, int, int, float) # stage, done, total, folders/s
+    finished = Signal(dict)
+    error_occurred = Signal(str)
 
-            with open(report_file_path, 'w') as f:
-                f.write("Identified Empty Folders:\n" + '\n'.join(empty_folders_report) + '\n')
+    def __init__(self, journal_path: str):
+        super().__init__()
+        self.journal_path = journal_path
 
-            with open(moved_report_file_path, 'w') as f:
-                f.write("Moved Folders Details:\n" + '\n'.join(moved_folders_report) + '\n')
+    def run(self):
+        try:
+            result = restore_obsolete_moves(self.journal_path, self.progress_updated.emit, self.isInterruptionRequested)
+            self.finished.emit(result)
+        except Exception as e:
+            self.error_occurred.emit(f"An error occurred while restoring folders: {e}")
 
-            final_message = f"The script has finished execution. Reports created:\n- {report_file_path}\n- {moved_report_file_path}"
-        else:
-            final_message = "No empty folders are present in the specified directory."
 
-        QMessageBox.information(None, "Empty Folder Deletion", final_message)
+# --- QThread for Batch Provisioning ---
+class BatchProvisioningWorker(QThread):
+    project_finished = Signal(int, dict)
+    finished = Signal(dict)
+    error_occurred = Signal(str)
 
-    except Exception as e:
-        QMessageBox.critical(None, "Error", f"An error occurred during empty folder deletion: {e}")
+    def __init__(self, projects: list, project_workers: int = BATCH_PROJECT_WORKERS):
+        super().__init__()
+        self.projects = projects
+        self.project_workers = project_workers
+
+    def run(self):
+        try:
+            summary = provision_projects(self.projects, self.project_workers, status_callback=self.project_finished.emit)
+            self.finished.emit(summary)
+        except Exception as e:
+            self.error_occurred.emit(f"An unexpected error occurred: {e}")
+
+# --- QThread for Refreshing a Project Inventory ---
+class InventoryWorker(QThread):
+    progress_updated = Signal(str, int, int, float) # stage, folders visited, 0, folders/s
+    finished = Signal(dict)
+    error_occurred = Signal(str)
+
+    def __init__(self, inventory):
+        super().__init__()
+        self.inventory = inventory
+
+    def run(self):
+        try:
+            result = self.inventory.refresh(progress_callback=self.progress_updated.emit,
+                                            should_stop=self.isInterruptionRequested)
+            if not result["cancelled"]:
+                self.inventory.save()
+            self.finished.emit(result)
+        except ValueError as e:
+            self.error_occurred.emit(str(e))
+        except Exception as e:
+            self.error_occurred.emit(f"An error occurred while indexing the project: {e}")
 
 # --- PySide6 UI Classes ---
 class FolderCreationTab(QWidget):
@@ -395,6 +390,7 @@ class FolderCreationTab(QWidget):
         self.languages_entry.setPlaceholderText("e.g., enIN, French(France), de-DE")
         # Let QLineEdit expand horizontally. Set a sensible minimum.
         self.languages_entry.setMinimumWidth(300)
+        self.languages_entry.textEdited.connect(self.install_language_completer) # Registry loads on first edit
         self.layout.addWidget(self.languages_entry)
         # No extra spacing here, relying on layout.setSpacing(10)
 
@@ -402,15 +398,28 @@ class FolderCreationTab(QWidget):
         self.layout.addWidget(QLabel("Select Methodologies:"))
         self.methodology_listbox = QListWidget()
         self.methodology_listbox.setSelectionMode(QAbstractItemView.MultiSelection)
-        methodologies = ["Adapt", "TEP", "LV", "FTBT", "Migration", "FLV", "Med_Devices", "CogDeb"]
+        methodologies = methodology_names() # Built-in layouts plus any methodology templates
         self.methodology_listbox.addItems(methodologies)
         # Use QSizePolicy to allow vertical expansion, but set a fixed width for alignment
         self.methodology_listbox.setFixedWidth(380) # Keep fixed width to match other elements
-        self.methodology_listbox.setMinimumHeight(len(methodologies) * 25) # Estimate height
+        self.methodology_listbox.setMinimumHeight(min(len(methodologies), 8) * 25) # Estimate height; scrolls past 8
         self.methodology_listbox.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
         self.layout.addWidget(self.methodology_listbox)
+
+        template_errors = methodology_template_errors()
+        if template_errors:
+            template_error_label = QLabel(f"{len(template_errors)} methodology template(s) could not be loaded "
+                                          "(hover for details)")
+            template_error_label.setToolTip("\n".join(template_errors))
+            self.layout.addWidget(template_error_label)
         # No extra spacing here
 
+        # Live plan preview (in memory only, recomputed as the selection changes)
+        self.plan_preview_label = QLabel("")
+        self.layout.addWidget(self.plan_preview_label)
+        self.languages_entry.textChanged.connect(self.update_plan_preview)
+        self.methodology_listbox.itemSelectionChanged.connect(self.update_plan_preview)
+
         # Folder Selection
         self.folder_selection_h_layout = QHBoxLayout()
         self.folder_entry = QLineEdit()
@@ -441,14 +450,59 @@ class FolderCreationTab(QWidget):
         self.create_button.setFixedSize(110, 32) # Smaller button
         self.create_button.clicked.connect(self.on_create_folders_clicked)
        
+        self.dry_run_button = QPushButton("Dry Run")
+        self.dry_run_button.setFixedSize(90, 32)
+        self.dry_run_button.clicked.connect(self.on_dry_run_clicked)
+       
         button_layout = QHBoxLayout() # Use a sub-layout to center the button
         button_layout.addStretch(1)
         button_layout.addWidget(self.create_button)
+        button_layout.addWidget(self.dry_run_button)
         button_layout.addStretch(1)
         self.layout.addLayout(button_layout)
 
         self.layout.addStretch(1) # Push content to the top
 
+    def install_language_completer(self, text):
+        self.languages_entry.textEdited.disconnect(self.install_language_completer)
+        completer = LanguageCompleter(language_registry().suggestions(), self.languages_entry)
+        self.languages_entry.setCompleter(completer)
+        completer.setCompletionPrefix(completer.splitPath(text)[0])
+        completer.complete()
+
+    def update_plan_preview(self):
+        languages = parse_languages(self.languages_entry.text())
+        selected_methodologies = [item.text() for item in self.methodology_listbox.selectedItems()]
+        if not languages or not selected_methodologies:
+            self.plan_preview_label.setText("")
+            return
+        preview = preview_folder_creation(None, languages, selected_methodologies, check_existing=False)
+        per_methodology = ", ".join(f"{name} {count:,}" for name, count in preview["per_methodology"].items())
+        text = f"Plan: {preview['planned']:,} folders ({per_methodology})"
+        if preview["languages"] != languages:
+            text += "\nLanguages: " + ", ".join(preview["languages"]) # Repeated languages dropped
+        if preview["code_collisions"]:
+            # A warning only: each language still gets its own folder inside the shared bucket
+            text += "\nSame language code: " + "; ".join(
+                f"{', '.join(shared)} -> {code}" for code, shared in preview["code_collisions"].items())
+        self.plan_preview_label.setText(text)
+
+    def on_dry_run_clicked(self):
+        languages = parse_languages(self.languages_entry.text())
+        selected_methodologies = [item.text() for item in self.methodology_listbox.selectedItems()]
+        if not languages or not selected_methodologies:
+            QMessageBox.warning(self, "Input Error", "Please enter at least one language and select at least one methodology.")
+            return
+
+        preview = preview_folder_creation(self.folder_entry.text(), languages, selected_methodologies)
+        lines = [f"{name}: {count:,} folders" for name, count in preview["per_methodology"].items()]
+        lines.append(f"Total (shared folders counted once): {preview['planned']:,} folders")
+        if preview["existing"] is not None:
+            lines.append(f"Already present: {preview['existing']:,}, to create: {preview['missing']:,}")
+        for code, shared in preview["code_collisions"].items():
+            lines.append(f"Language code collision: {', '.join(shared)} all map to {code}")
+        QMessageBox.information(self, "Dry Run", "\n".join(lines))
+
     def on_create_folders_clicked(self):
         languages = self.languages_entry.text()
         selected_methodologies = [item.text() for item in self.methodology_listbox.selectedItems()]
@@ -457,6 +511,27 @@ class FolderCreationTab(QWidget):
         if not path:
             QMessageBox.warning(self, "Input Error", "Please select a folder to create structures in.")
             return
+
+        resume = False
+        state = read_creation_state(path)
+        if state is not None:
+            answer = QMessageBox.question(
+                self, "Resume Folder Creation",
+                f"An unfinished folder creation run from {state.get('started', 'an earlier session')} was found "
+                f"({len(state['completed'])} parts done).\n\nResume it with its languages and methodologies? "
+                "Choose No to start a new run instead.",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel)
+            if answer == QMessageBox.Cancel:
+                return
+            if answer == QMessageBox.Yes:
+                resume = True
+                languages = ",".join(state["languages"])
+                selected_methodologies = state["methodologies"]
+                self.languages_entry.setText(languages)
+                for index in range(self.methodology_listbox.count()):
+                    item = self.methodology_listbox.item(index)
+                    item.setSelected(item.text() in selected_methodologies)
+
         if not languages:
             QMessageBox.warning(self, "Input Error", "Please enter at least one language.")
             return
@@ -464,44 +539,59 @@ class FolderCreationTab(QWidget):
             QMessageBox.warning(self, "Input Error", "Please select at least one methodology.")
             return
 
-        parsed_languages = [lang.strip() for lang in languages.split(',') if lang.strip()]
+        parsed_languages = parse_languages(languages)
         if not parsed_languages:
             QMessageBox.warning(self, "Input Error", "Languages input is invalid.")
             return
 
         self.create_button.setEnabled(False)
+        self.dry_run_button.setEnabled(False)
         self.languages_entry.setEnabled(False)
         self.methodology_listbox.setEnabled(False)
         self.folder_entry.setEnabled(False)
         self.browse_button.setEnabled(False) # Disable browse button during operation
 
-        total_languages_iterations = len(parsed_languages) * len(selected_methodologies)
-        self.progress_bar.setMaximum(total_languages_iterations)
+        self.progress_bar.setMaximum(0) # Busy until the worker reports the plan size
         self.progress_bar.setValue(0)
 
-        self.worker_thread = FolderCreationWorker(languages, selected_methodologies, path)
+        self.worker_thread = FolderCreationWorker(languages, selected_methodologies, path, resume=resume)
         self.worker_thread.progress_updated.connect(self.update_progress)
         self.worker_thread.finished.connect(self.on_creation_finished)
         self.worker_thread.error_occurred.connect(self.on_creation_error)
         self.worker_thread.start()
 
-    def update_progress(self, increment):
-        current_value = self.progress_bar.value()
-        self.progress_bar.setValue(current_value + increment)
+    def update_progress(self, stage, done, total, eta):
+        # Values are absolute and already rate limited by the worker's ProgressChannel
+        if self.progress_bar.maximum() != total:
+            self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+        eta_text = f" - ETA {eta:.0f}s" if eta >= 0 else ""
+        self.progress_bar.setFormat(f"{stage}: %v / %m{eta_text}" if total else f"{stage}...")
 
-    def on_creation_finished(self):
+    def on_creation_finished(self, result):
         self.progress_bar.setValue(self.progress_bar.maximum())
-        QMessageBox.information(self, "Success", "Folder structure created successfully!")
+        message = ("Folder structure created successfully!\n"
+                   f"Created: {result['created']:,} folders, already present: {result['existing']:,}")
+        if result.get("resumed"):
+            message += f"\nResumed an unfinished run, skipping {result['skipped_units']:,} finished parts"
+        for code, shared in result.get("code_collisions", {}).items():
+            message += f"\nNote: {', '.join(shared)} share the language code folder {code}"
+        if result.get("metrics"):
+            message += "\n\n" + describe_metrics(result["metrics"])
+        QMessageBox.information(self, "Success", message)
         self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
         self.enable_ui_elements()
 
     def on_creation_error(self, message):
         QMessageBox.critical(self, "Error", message)
         self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
         self.enable_ui_elements()
 
     def enable_ui_elements(self):
         self.create_button.setEnabled(True)
+        self.dry_run_button.setEnabled(True)
         self.languages_entry.setEnabled(True)
         self.methodology_listbox.setEnabled(True)
         self.folder_entry.setEnabled(True)
@@ -510,6 +600,9 @@ class FolderCreationTab(QWidget):
 class EmptyFolderDeletionTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.worker_thread = None
+        self.watch_thread = None
+        self.watcher = None
         self.init_ui()
 
     def init_ui(self):
@@ -530,31 +623,507 @@ class EmptyFolderDeletionTab(QWidget):
         self.path_entry_efd.setReadOnly(True)
         self.path_entry_efd.setMinimumWidth(300) # Maintain consistent minimum width
        
-        browse_button = QPushButton("Browse")
-        browse_button.setFixedSize(70, 28) # Consistent with FolderCreationTab's browse button
-        browse_button.clicked.connect(lambda: browse_folder_pyside(self.path_entry_efd))
+        self.browse_button = QPushButton("Browse")
+        self.browse_button.setFixedSize(70, 28) # Consistent with FolderCreationTab's browse button
+        self.browse_button.clicked.connect(lambda: browse_folder_pyside(self.path_entry_efd))
        
         folder_selection_h_layout.addWidget(self.path_entry_efd)
-        folder_selection_h_layout.addWidget(browse_button)
+        folder_selection_h_layout.addWidget(self.browse_button)
         layout.addLayout(folder_selection_h_layout)
         # No extra spacing here
 
-        # Delete Button (centered horizontally, smaller)
-        delete_button = QPushButton("Delete Empty Folders")
-        delete_button.setFixedSize(180, 32) # Smaller button
-        delete_button.clicked.connect(self.on_delete_empty_folders_clicked)
+        # Progress Bar and status line (scan has no known total, so the bar runs busy until moving starts)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setMinimum(0)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFixedWidth(380) # Same width as FolderCreationTab's progress bar
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        # Scan cache options (cache lives in _Obsolete/scan_cache.sqlite)
+        cache_options_layout = QHBoxLayout()
+        self.scan_cache_checkbox = QCheckBox("Reuse scan cache")
+        self.scan_cache_checkbox.setToolTip("Skip re-listing folders unchanged since the last cached cleanup")
+        self.force_rescan_checkbox = QCheckBox("Force full rescan")
+        self.force_rescan_checkbox.setToolTip("Ignore the scan cache, list every folder and rebuild the cache")
+        self.watch_checkbox = QCheckBox("Watch folder")
+        self.watch_checkbox.setToolTip("Keep a live index of empty folders, so cleanups and dry runs need no scan")
+        self.watch_checkbox.toggled.connect(self.on_watch_toggled)
+        cache_options_layout.addWidget(self.scan_cache_checkbox)
+        cache_options_layout.addWidget(self.force_rescan_checkbox)
+        cache_options_layout.addWidget(self.watch_checkbox)
+        cache_options_layout.addStretch(1)
+        layout.addLayout(cache_options_layout)
+
+        self.watch_status_label = QLabel("")
+        layout.addWidget(self.watch_status_label)
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setInterval(1000)
+        self.watch_timer.timeout.connect(self.update_watch_status)
+        self.path_entry_efd.textChanged.connect(self.on_path_changed)
+
+        # Delete and Cancel Buttons (centered horizontally, smaller)
+        self.delete_button = QPushButton("Delete Empty Folders")
+        self.delete_button.setFixedSize(180, 32) # Smaller button
+        self.delete_button.clicked.connect(lambda: self.on_delete_empty_folders_clicked())
+
+        self.dry_run_button = QPushButton("Dry Run")
+        self.dry_run_button.setFixedSize(90, 32)
+        self.dry_run_button.clicked.connect(lambda: self.on_delete_empty_folders_clicked(dry_run=True))
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setFixedSize(90, 32)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.on_cancel_clicked)
        
         button_layout_efd = QHBoxLayout()
         button_layout_efd.addStretch(1)
-        button_layout_efd.addWidget(delete_button)
+        button_layout_efd.addWidget(self.delete_button)
+        button_layout_efd.addWidget(self.dry_run_button)
+        button_layout_efd.addWidget(self.cancel_button)
         button_layout_efd.addStretch(1)
         layout.addLayout(button_layout_efd)
 
+        # Undo the most recent cleanup of the selected folder from its restore journal
+        self.restore_button = QPushButton("Undo Last Cleanup")
+        self.restore_button.setFixedSize(180, 32)
+        self.restore_button.clicked.connect(self.on_restore_clicked)
+        # Browse the moved/failed entries of the last cleanup, however many there are
+        self.results_button = QPushButton("View Results")
+        self.results_button.setFixedSize(130, 32)
+        self.results_button.clicked.connect(self.on_view_results_clicked)
+        restore_layout = QHBoxLayout()
+        restore_layout.addStretch(1)
+        restore_layout.addWidget(self.restore_button)
+        restore_layout.addWidget(self.results_button)
+        restore_layout.addStretch(1)
+        layout.addLayout(restore_layout)
+
         layout.addStretch(1) # Keep stretch here if this tab is shorter and you want content to stick to top
 
-    def on_delete_empty_folders_clicked(self):
+    def on_delete_empty_folders_clicked(self, dry_run=False):
         path = self.path_entry_efd.text()
-        process_empty_folder_deletion_logic(path)
+        if not path or not os.path.isdir(path):
+            QMessageBox.warning(self, "Input Error", "Please enter a valid path to clean.")
+            return
+
+        self.set_running()
+        self.status_label.setText("Scanning...")
+
+        self.worker_thread = EmptyFolderDeletionWorker(path, dry_run, self.scan_cache_checkbox.isChecked(),
+                                                       self.force_rescan_checkbox.isChecked(),
+                                                       self.watcher.index if self.watcher is not None else None)
+        self.worker_thread.progress_updated.connect(self.update_progress)
+        self.worker_thread.finished.connect(self.on_deletion_finished)
+        self.worker_thread.error_occurred.connect(self.on_deletion_error)
+        self.worker_thread.start()
+
+    def on_watch_toggled(self, checked):
+        if not checked:
+            self.stop_watching()
+            return
+        path = self.path_entry_efd.text()
+        if not path or not os.path.isdir(path):
+            QMessageBox.warning(self, "Input Error", "Please enter a valid path to clean.")
+            self.watch_checkbox.setChecked(False)
+            return
+        self.watch_checkbox.setEnabled(False)
+        self.watch_status_label.setText("Indexing folders for watch mode...")
+        self.watch_thread = WatchStartWorker(path)
+        self.watch_thread.finished.connect(self.on_watch_started)
+        self.watch_thread.error_occurred.connect(self.on_watch_error)
+        self.watch_thread.start()
+
+    def on_watch_started(self, watcher):
+        self.watcher = watcher
+        self.watch_checkbox.setEnabled(True)
+        self.update_watch_status()
+        self.watch_timer.start()
+
+    def on_watch_error(self, message):
+        QMessageBox.critical(self, "Error", message)
+        self.watch_checkbox.setEnabled(True)
+        self.watch_checkbox.setChecked(False)
+
+    def on_path_changed(self, path):
+        if self.watcher is not None and self.watcher.index.root != path:
+            self.watch_checkbox.setChecked(False)
+
+    def update_watch_status(self):
+        if self.watcher is not None:
+            self.watch_status_label.setText(f"Watching ({self.watcher.backend}): "
+                                            f"{len(self.watcher.index):,} folders indexed")
+
+    def stop_watching(self):
+        self.watch_timer.stop()
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        self.watch_status_label.setText("")
+
+    def set_running(self):
+        self.delete_button.setEnabled(False)
+        self.dry_run_button.setEnabled(False)
+        self.restore_button.setEnabled(False)
+        self.browse_button.setEnabled(False)
+        self.path_entry_efd.setEnabled(False)
+        self.scan_cache_checkbox.setEnabled(False)
+        self.force_rescan_checkbox.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setMaximum(0) # Busy indicator until the first progress update
+        self.progress_bar.setValue(0)
+
+    def on_restore_clicked(self):
+        path = self.path_entry_efd.text()
+        if not path or not os.path.isdir(path):
+            QMessageBox.warning(self, "Input Error", "Please enter a valid path to clean.")
+            return
+        journals = find_move_journals(path)
+        if not journals:
+            QMessageBox.information(self, "Undo Cleanup", "No earlier cleanup of this folder can be undone.")
+            return
+        try:
+            entry_count = len(read_move_journal(journals[0]))
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"The restore journal could not be read: {e}")
+            return
+        answer = QMessageBox.question(self, "Undo Cleanup",
+                                      f"Move {entry_count:,} folders from {os.path.basename(journals[0])} "
+                                      "back to their original locations?")
+        if answer != QMessageBox.Yes:
+            return
+
+        self.set_running()
+        self.status_label.setText("Restoring...")
+        self.worker_thread = RestoreWorker(journals[0])
+        self.worker_thread.progress_updated.connect(self.update_progress)
+        self.worker_thread.finished.connect(self.on_restore_finished)
+        self.worker_thread.error_occurred.connect(self.on_deletion_error)
+        self.worker_thread.start()
+
+    def results_report_path(self):
+        return os.path.join(self.path_entry_efd.text(), f"{MOVED_REPORT_NAME}.jsonl")
+
+    def on_view_results_clicked(self):
+        report_path = self.results_report_path()
+        if not os.path.isfile(report_path):
+            QMessageBox.information(self, "View Results", "No cleanup results with details were found for this folder.")
+            return
+        ReportViewerDialog(report_path, self).exec()
+
+    def on_cancel_clicked(self):
+        if self.worker_thread is not None:
+            self.worker_thread.requestInterruption()
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("Cancelling...")
+
+    def update_progress(self, stage, done, total, rate):
+        if stage == "scan":
+            self.status_label.setText(f"Scanning: {done:,} folders ({rate:,.0f} folders/s)")
+        else:
+            if self.progress_bar.maximum() != total:
+                self.progress_bar.setMaximum(total)
+            self.progress_bar.setValue(done)
+            action = "Restoring" if stage == "restore" else "Moving"
+            self.status_label.setText(f"{action}: {done:,} of {total:,} folders ({rate:,.0f} folders/s)")
+
+    def on_deletion_finished(self, result):
+        self.progress_bar.setMaximum(1)
+        self.progress_bar.setValue(1)
+        title = "Dry Run" if self.worker_thread.dry_run else "Empty Folder Deletion"
+        message = result["message"]
+        if result.get("metrics"):
+            message += "\n\n" + describe_metrics(result["metrics"])
+        QMessageBox.information(self, title, message)
+        self.reset_progress()
+
+    def on_restore_finished(self, result):
+        self.progress_bar.setMaximum(1)
+        self.progress_bar.setValue(1)
+        QMessageBox.information(self, "Undo Cleanup", result["message"])
+        self.reset_progress()
+
+    def on_deletion_error(self, message):
+        QMessageBox.critical(self, "Error", message)
+        self.reset_progress()
+
+    def reset_progress(self):
+        self.progress_bar.setValue(0)
+        self.status_label.setText("")
+        self.delete_button.setEnabled(True)
+        self.dry_run_button.setEnabled(True)
+        self.restore_button.setEnabled(True)
+        self.browse_button.setEnabled(True)
+        self.path_entry_efd.setEnabled(True)
+        self.scan_cache_checkbox.setEnabled(True)
+        self.force_rescan_checkbox.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+class BatchProvisioningTab(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker_thread = None
+        self.projects = []
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15) # Consistent padding
+        layout.setSpacing(10) # Consistent spacing
+
+        tab_title_label = QLabel("Batch Provisioning")
+        tab_title_label.setObjectName("TitleLabel")
+        layout.addWidget(tab_title_label)
+        layout.addSpacing(10)
+
+        # Manifest Selection
+        layout.addWidget(QLabel("Select Manifest (CSV, JSON or YAML):"))
+        manifest_h_layout = QHBoxLayout()
+        self.manifest_entry = QLineEdit()
+        self.manifest_entry.setPlaceholderText("Browse for a path/languages/methodologies manifest...")
+        self.manifest_entry.setReadOnly(True)
+        self.manifest_entry.setMinimumWidth(300) # Maintain consistent minimum width
+
+        self.browse_button = QPushButton("Browse")
+        self.browse_button.setFixedSize(70, 28) # Consistent with the other tabs' browse buttons
+        self.browse_button.clicked.connect(self.on_browse_manifest_clicked)
+
+        manifest_h_layout.addWidget(self.manifest_entry)
+        manifest_h_layout.addWidget(self.browse_button)
+        layout.addLayout(manifest_h_layout)
+
+        # Per-project status list
+        self.project_listbox = QListWidget()
+        self.project_listbox.setSelectionMode(QAbstractItemView.NoSelection)
+        self.project_listbox.setFixedWidth(380) # Same width as the methodology list
+        self.project_listbox.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
+        layout.addWidget(self.project_listbox)
+
+        # Progress Bar and throughput line
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setMinimum(0)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFixedWidth(380)
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        # Provision Button (centered horizontally, smaller)
+        self.provision_button = QPushButton("Provision All")
+        self.provision_button.setFixedSize(130, 32)
+        self.provision_button.setEnabled(False)
+        self.provision_button.clicked.connect(self.on_provision_clicked)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch(1)
+        button_layout.addWidget(self.provision_button)
+        button_layout.addStretch(1)
+        layout.addLayout(button_layout)
+
+    def on_browse_manifest_clicked(self):
+        manifest_path, _ = QFileDialog.getOpenFileName(self, "Select Manifest", "",
+                                                       "Manifests (*.csv *.json *.yaml *.yml)")
+        if not manifest_path:
+            return
+        try:
+            self.projects = load_manifest(manifest_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Manifest Error", str(e))
+            return
+
+        self.manifest_entry.setText(manifest_path)
+        self.project_listbox.clear()
+        for project in self.projects:
+            self.project_listbox.addItem(self.project_status_text(project, "pending"))
+        self.status_label.setText(f"{len(self.projects)} projects loaded.")
+        self.provision_button.setEnabled(bool(self.projects))
+
+    @staticmethod
+    def project_status_text(project, status):
+        return f"[{status}] {project['path']} ({len(project['languages'])} languages, {', '.join(project['methodologies'])})"
+
+    def on_provision_clicked(self):
+        self.provision_button.setEnabled(False)
+        self.browse_button.setEnabled(False)
+        self.progress_bar.setMaximum(len(self.projects))
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Provisioning...")
+
+        self.worker_thread = BatchProvisioningWorker(self.projects)
+        self.worker_thread.project_finished.connect(self.on_project_finished)
+        self.worker_thread.finished.connect(self.on_batch_finished)
+        self.worker_thread.error_occurred.connect(self.on_batch_error)
+        self.worker_thread.start()
+
+    def on_project_finished(self, index, result):
+        if result["status"] == "ok":
+            status = f"ok, {result['created']:,} created"
+        else:
+            status = f"error: {result['error']}"
+        self.project_listbox.item(index).setText(self.project_status_text(self.projects[index], status))
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+
+    def on_batch_finished(self, summary):
+        self.status_label.setText(f"{summary['succeeded']} of {summary['projects']} projects in {summary['elapsed']:.1f}s "
+                                  f"({summary['projects_per_second']:.1f} projects/s, {summary['folders_per_second']:,.0f} folders/s)")
+        QMessageBox.information(self, "Batch Provisioning",
+                                f"Provisioned {summary['succeeded']} of {summary['projects']} projects "
+                                f"({summary['failed']} failed, {summary['folders_created']:,} folders created).")
+        self.enable_ui_elements()
+
+    def on_batch_error(self, message):
+        QMessageBox.critical(self, "Error", message)
+        self.enable_ui_elements()
+
+    def enable_ui_elements(self):
+        self.provision_button.setEnabled(bool(self.projects))
+        self.browse_button.setEnabled(True)
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+class InventoryTab(QWidget):
+    COLUMNS = ("Language", "Methodology", "Stage", "Files", "Size")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker_thread = None
+        self.inventory = None
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15) # Consistent padding
+        layout.setSpacing(10) # Consistent spacing
+
+        tab_title_label = QLabel("Project Inventory")
+        tab_title_label.setObjectName("TitleLabel")
+        layout.addWidget(tab_title_label)
+        layout.addSpacing(10)
+
+        # Project Selection
+        layout.addWidget(QLabel("Select Project Folder:"))
+        project_h_layout = QHBoxLayout()
+        self.project_entry = QLineEdit()
+        self.project_entry.setPlaceholderText("Browse for a project with a Work/06_Target folder...")
+        self.project_entry.setReadOnly(True)
+        self.project_entry.setMinimumWidth(300) # Maintain consistent minimum width
+        self.project_entry.textChanged.connect(self.on_project_changed)
+
+        self.browse_button = QPushButton("Browse")
+        self.browse_button.setFixedSize(70, 28) # Consistent with the other tabs' browse buttons
+        self.browse_button.clicked.connect(lambda: browse_folder_pyside(self.project_entry))
+
+        project_h_layout.addWidget(self.project_entry)
+        project_h_layout.addWidget(self.browse_button)
+        layout.addLayout(project_h_layout)
+
+        # Filters (fnmatch patterns, applied to the in-memory index as they are typed)
+        filter_h_layout = QHBoxLayout()
+        self.stage_filter = QLineEdit()
+        self.stage_filter.setPlaceholderText("Stage, e.g. 03_BT/02_fromLing or */02_fromLing")
+        self.methodology_filter = QLineEdit()
+        self.methodology_filter.setPlaceholderText("Methodology")
+        self.methodology_filter.setFixedWidth(110)
+        filter_h_layout.addWidget(self.stage_filter)
+        filter_h_layout.addWidget(self.methodology_filter)
+        layout.addLayout(filter_h_layout)
+        self.empty_only_checkbox = QCheckBox("Only stages without files")
+        layout.addWidget(self.empty_only_checkbox)
+        for signal in (self.stage_filter.textChanged, self.methodology_filter.textChanged,
+                       self.empty_only_checkbox.toggled):
+            signal.connect(self.update_results)
+
+        self.results_table = QTableWidget(0, len(self.COLUMNS))
+        self.results_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results_table.verticalHeader().setVisible(False)
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.results_table.horizontalHeader().setStretchLastSection(True)
+        self.results_table.setFixedWidth(380) # Same width as the other tabs' lists
+        self.results_table.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
+        layout.addWidget(self.results_table)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        # Refresh Button (centered horizontally, smaller)
+        self.refresh_button = QPushButton("Refresh Index")
+        self.refresh_button.setFixedSize(130, 32)
+        self.refresh_button.setEnabled(False)
+        self.refresh_button.clicked.connect(self.on_refresh_clicked)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch(1)
+        button_layout.addWidget(self.refresh_button)
+        button_layout.addStretch(1)
+        layout.addLayout(button_layout)
+
+    def on_project_changed(self, path):
+        # Opening only reads the saved index; the tree is walked on Refresh
+        self.inventory = ProjectInventory(path) if path else None
+        self.refresh_button.setEnabled(self.inventory is not None)
+        self.update_results()
+
+    def update_results(self):
+        if self.inventory is None:
+            return
+        if self.inventory.updated is None:
+            self.results_table.setRowCount(0)
+            self.status_label.setText("This project has not been indexed yet. Click Refresh Index.")
+            return
+        started = time.perf_counter()
+        rows = self.inventory.query(stage=self.stage_filter.text().strip() or None,
+                                    methodology=self.methodology_filter.text().strip() or None,
+                                    empty=True if self.empty_only_checkbox.isChecked() else None)
+        elapsed = time.perf_counter() - started
+        self.results_table.setUpdatesEnabled(False)
+        self.results_table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            values = (row["language"], row["methodology"], row["stage"], f"{row['files']:,}", format_bytes(row["bytes"]))
+            for column, value in enumerate(values):
+                self.results_table.setItem(row_index, column, QTableWidgetItem(value))
+        self.results_table.setUpdatesEnabled(True)
+        languages = len({row["language"] for row in rows})
+        self.status_label.setText(f"{len(rows):,} stages in {languages} languages ({elapsed * 1000:.1f} ms), "
+                                  f"index from {self.inventory.updated}")
+
+    def on_refresh_clicked(self):
+        self.refresh_button.setEnabled(False)
+        self.browse_button.setEnabled(False)
+        self.status_label.setText("Indexing...")
+        self.worker_thread = InventoryWorker(self.inventory)
+        self.worker_thread.progress_updated.connect(self.update_progress)
+        self.worker_thread.finished.connect(self.on_refresh_finished)
+        self.worker_thread.error_occurred.connect(self.on_refresh_error)
+        self.worker_thread.start()
+
+    def update_progress(self, stage, done, total, rate):
+        self.status_label.setText(f"Indexing: {done:,} folders ({rate:,.0f}/s)")
+
+    def on_refresh_finished(self, result):
+        self.enable_ui_elements()
+        self.update_results()
+        self.status_label.setText(self.status_label.text() +
+                                  f" - {result['listed']:,} folders listed, {result['reused']:,} unchanged")
+
+    def on_refresh_error(self, message):
+        QMessageBox.critical(self, "Error", message)
+        self.status_label.setText("")
+        self.enable_ui_elements()
+
+    def enable_ui_elements(self):
+        self.refresh_button.setEnabled(self.inventory is not None)
+        self.browse_button.setEnabled(True)
 
 # Custom Title Bar Widget
 class CustomTitleBar(QWidget):
@@ -631,21 +1200,13 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Window)
         self.old_pos = self.pos()
+        self.first_paint_done = False
         self.init_ui()
         self.set_calculated_size()
 
     def set_calculated_size(self):
-        # Create a dummy instance of FolderCreationTab to get its preferred size
-        temp_tab = FolderCreationTab()
-        # It's crucial to put it in a temporary layout to allow its internal layouts to calculate sizes
-        dummy_container = QWidget()
-        dummy_container_layout = QVBoxLayout(dummy_container)
-        dummy_container_layout.addWidget(temp_tab)
-        dummy_container.setLayout(dummy_container_layout)
-        dummy_container_layout.activate() # Force layout recalculation
-       
-        # Get the size hint after layouts have been calculated
-        content_size_hint = temp_tab.sizeHint()
+        # The size is computed from the known layout metrics below; no widgets are built for it
+        # (a throwaway FolderCreationTab's sizeHint is unreliable before a show() cycle anyway).
 
         # Calculate width: Max of fixed widths (380 for listbox/progress bar) + padding + border
         # Max input widget width (listbox, progress bar) is 380px.
@@ -673,9 +1234,7 @@ class MainWindow(QMainWindow):
         # Let's sum based on the `init_ui` layout and estimated widget heights/spacing
         # (Assuming default label height ~18px, lineedit/button height ~28-35px, progress bar ~20px, listbox ~200px)
        
-        # A more dynamic way to sum heights would be `temp_tab.sizeHint().height()`, but it often returns
-        # less accurate values without a full `show()` and `adjustSize()` cycle.
-        # Manual sum for now based on common widget heights and specified spacings:
+        # Manual sum based on common widget heights and specified spacings:
         content_height_sum = (
             30 +  # TitleLabel (generous est based on font size)
             10 +  # Spacing after title
@@ -685,23 +1244,21 @@ class MainWindow(QMainWindow):
             18 +  # Methodologies Label
             200 + # Methodology Listbox (approx. 8 items * 25px)
             10 +  # Spacing
+            18 +  # Plan preview label
+            10 +  # Spacing
             30 +  # Folder Entry/Browse row (QLineEdit/QPushButton heights 28-30)
             10 +  # Spacing
             20 +  # Progress Bar
             10 +  # Spacing
             35    # Create Button (with padding from stylesheet)
-        ) # Sum of typical heights + 10px spacing = ~421px
+        ) # Sum of typical heights + 10px spacing = ~449px
 
         # Add the tab pane extras and title bar height
         calculated_height = title_bar_height + tab_pane_vertical_extras + content_height_sum + 10 # 10 for bottom stretch/buffer
-        # 30 (title bar) + 32 (tab pane padding/border) + 421 (content) + 10 (buffer) = 493
+        # 30 (title bar) + 32 (tab pane padding/border) + 449 (content) + 10 (buffer) = 521
 
         # Set final calculated size
-        self.setFixedSize(QSize(534, 495)) # Adjusted to fit slightly better based on my run
-
-        # Clean up dummy widget and tab
-        dummy_container.deleteLater()
-        temp_tab.deleteLater()
+        self.setFixedSize(QSize(calculated_width, 523)) # Height adjusted to fit slightly better based on my run (+28 for the plan preview line)
 
 
     def get_stylesheet(self):
@@ -886,6 +1443,33 @@ class MainWindow(QMainWindow):
             QListWidget::item:hover:!selected {
                 background-color: #444444;
             }
+            QTableWidget {
+                background-color: #333333;
+                color: white;
+                border: 1px solid #555555;
+                border-radius: 5px;
+                gridline-color: #444444;
+                font-family: 'Segoe UI', Arial, sans-serif;
+                font-size: 11px;
+            }
+            QTableWidget::item:selected {
+                background-color: #ff6600;
+                color: white;
+            }
+            QHeaderView::section {
+                background-color: #444444;
+                color: #ffffff;
+                border: none;
+                padding: 4px;
+                font-family: 'Segoe UI', Arial, sans-serif;
+                font-size: 11px;
+                font-weight: bold;
+            }
+            QCheckBox {
+                color: #ffffff;
+                font-family: 'Segoe UI', Arial, sans-serif;
+                font-size: 11px;
+            }
             QProgressBar {
                 border: 1px solid #555555;
                 border-radius: 5px; /* Consistent with other elements */
@@ -919,11 +1503,24 @@ class MainWindow(QMainWindow):
         self.tab_widget = QTabWidget()
         self.tab_widget.setTabPosition(QTabWidget.West)
 
-        self.folder_creation_tab = FolderCreationTab()
-        self.empty_folder_deletion_tab = EmptyFolderDeletionTab()
-
-        self.tab_widget.addTab(self.folder_creation_tab, "Folder Creation")
-        self.tab_widget.addTab(self.empty_folder_deletion_tab, "Empty Folder Deletion")
+        # Tabs are built the first time they are shown; until then each page is an empty container
+        self.folder_creation_tab = None
+        self.empty_folder_deletion_tab = None
+        self.batch_provisioning_tab = None
+        self.inventory_tab = None
+        self.lazy_tabs = [
+            (FolderCreationTab, "folder_creation_tab"),
+            (EmptyFolderDeletionTab, "empty_folder_deletion_tab"),
+            (BatchProvisioningTab, "batch_provisioning_tab"),
+            (InventoryTab, "inventory_tab"),
+        ]
+        for title in ("Folder Creation", "Empty Folder Deletion", "Batch Provisioning", "Inventory"):
+            container = QWidget()
+            container_layout = QVBoxLayout(container)
+            container_layout.setContentsMargins(0, 0, 0, 0)
+            self.tab_widget.addTab(container, title)
+        self.tab_widget.currentChanged.connect(self.ensure_tab_built)
+        self.ensure_tab_built(self.tab_widget.currentIndex())
 
         content_layout.addWidget(self.tab_widget)
         main_vertical_layout.addWidget(content_widget)
@@ -932,12 +1529,30 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central_widget)
         central_widget.setLayout(main_vertical_layout)
 
+    def ensure_tab_built(self, index):
+        tab_class, attribute = self.lazy_tabs[index]
+        if getattr(self, attribute) is None:
+            tab = tab_class()
+            self.tab_widget.widget(index).layout().addWidget(tab)
+            setattr(self, attribute, tab)
+            mark_startup(f"{attribute} built")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            mark_startup("first paint")
+            print_startup_trace()
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    mark_startup("QApplication")
    
     main_window = MainWindow()
     app.setStyleSheet(main_window.get_stylesheet())
+    mark_startup("window")
 
     main_window.show()
     sys.exit(app.exec())
+
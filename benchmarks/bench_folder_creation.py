@@ -0,0 +1,75 @@
+"""Compares serial and parallel folder creation.
+
+Runs create_folder_structure for every methodology against a local folder (tmpfs when /dev/shm exists)
+and against a simulated network share where every mkdir pays a fixed latency.
+
+Usage: python benchmarks/bench_folder_creation.py [--languages 40] [--workers 8] [--latency-ms 3]
+"""
+import argparse
+import os
+import shutil
+import string
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import james_core
+
+
+@contextmanager
+def slow_mkdir(latency):
+    """Makes every planned mkdir sleep for latency seconds first, like a round trip to a share."""
+    original = james_core._make_planned_directory
+
+    def throttled(full_path, *args):
+        time.sleep(latency)
+        return original(full_path, *args)
+
+    james_core._make_planned_directory = throttled
+    try:
+        yield
+    finally:
+        james_core._make_planned_directory = original
+
+
+def time_creation(root, languages, methodologies, max_workers):
+    target = tempfile.mkdtemp(prefix="bench_create_", dir=root)
+    try:
+        started = time.perf_counter()
+        james_core.create_folder_structure(target, languages, methodologies, max_workers=max_workers)
+        return time.perf_counter() - started
+    finally:
+        shutil.rmtree(target, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--languages", type=int, default=40)
+    parser.add_argument("--methodologies", default=",".join(james_core.METHODOLOGY_LAYOUTS))
+    parser.add_argument("--workers", type=int, default=james_core.FOLDER_CREATION_WORKERS)
+    parser.add_argument("--latency-ms", type=float, default=3.0)
+    parser.add_argument("--root", default="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    args = parser.parse_args()
+
+    # Distinct first letters, so every language gets its own Med_Devices language code (aaXX, abXX, ...)
+    languages = [f"{string.ascii_lowercase[i // 26 % 26]}{string.ascii_lowercase[i % 26]}{i:03d}-XX"
+                 for i in range(args.languages)]
+    methodologies = args.methodologies.split(",")
+    plan = james_core.build_folder_plan(languages, methodologies)
+    print(f"{len(plan)} folders planned ({args.languages} languages)")
+
+    local_root = args.root or tempfile.gettempdir()
+    for label, max_workers in (("serial", 1), (f"parallel x{args.workers}", args.workers)):
+        elapsed = time_creation(local_root, languages, methodologies, max_workers)
+        print(f"local {local_root:<12} {label:<14} {elapsed:8.3f}s")
+
+    with slow_mkdir(args.latency_ms / 1000):
+        for label, max_workers in (("serial", 1), (f"parallel x{args.workers}", args.workers)):
+            elapsed = time_creation(tempfile.gettempdir(), languages, methodologies, max_workers)
+            print(f"slow  {args.latency_ms:>6.1f}ms/op {label:<14} {elapsed:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
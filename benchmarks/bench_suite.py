@@ -0,0 +1,174 @@
+"""Production-scale benchmark for folder creation and empty folder cleanup.
+
+Generates a synthetic project (N languages x every methodology) in a temporary folder, fills a
+fraction of the leaf folders with a file and leaves the rest empty, then times each stage:
+create, scan, move and report writing. Filesystem calls (mkdir, scandir, rename, stat, ...) are
+counted per stage. Results are saved as JSON; pass --compare with an earlier result to see the
+speedup per stage. --latency-ms adds a delay to every counted call to mimic a network share, e.g.
+compare --scan-workers 1 against the default there. Only james_core is imported, so no GUI or
+PySide6 is needed.
+
+Usage: python benchmarks/bench_suite.py [--languages 40] [--populated-fraction 0.3] [--latency-ms 0] [--output FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import string
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import james_core
+
+COUNTED_OS_FUNCTIONS = ("mkdir", "makedirs", "scandir", "listdir", "rename", "rmdir", "stat", "lstat")
+
+
+class OpCounter:
+    """Counts calls to the os functions in COUNTED_OS_FUNCTIONS while counting() is active.
+
+    With a latency (seconds) every counted call sleeps first, like a round trip to a file server.
+    """
+
+    def __init__(self, latency=0.0):
+        self.counts = Counter()
+        self.latency = latency
+        self._lock = threading.Lock()
+
+    def _wrap(self, name, function):
+        def counted(*args, **kwargs):
+            with self._lock:
+                self.counts[name] += 1
+            if self.latency:
+                time.sleep(self.latency)
+            return function(*args, **kwargs)
+        return counted
+
+    @contextmanager
+    def counting(self):
+        originals = {name: getattr(os, name) for name in COUNTED_OS_FUNCTIONS}
+        for name, function in originals.items():
+            setattr(os, name, self._wrap(name, function))
+        try:
+            yield self
+        finally:
+            for name, function in originals.items():
+                setattr(os, name, function)
+
+
+def run_stage(stages, name, latency, function, *args, **kwargs):
+    """Runs one stage, recording its wall time and filesystem call counts, and returns its result."""
+    counter = OpCounter(latency)
+    with counter.counting():
+        started = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+    stages[name] = {"seconds": round(elapsed, 4), "ops": dict(sorted(counter.counts.items()))}
+    print(f"{name:<8} {elapsed:9.3f}s  {sum(counter.counts.values()):>9,} fs calls", flush=True)
+    return result
+
+
+def populate_leaves(project_path, plan, populated_fraction, seed):
+    """Drops a small file into a random fraction of the plan's leaf folders; returns how many."""
+    parents = {os.path.dirname(relative_path) for relative_path in plan}
+    leaves = sorted(relative_path for relative_path in plan if relative_path not in parents)
+    populated = random.Random(seed).sample(leaves, int(len(leaves) * populated_fraction))
+    for relative_path in populated:
+        with open(os.path.join(project_path, relative_path, "document.txt"), "w") as f:
+            f.write("benchmark\n")
+    return len(leaves), len(populated)
+
+
+def write_reports(project_path, empty_roots):
+    """Streams the identified-folders report (text and JSONL) and returns the bytes written."""
+    text_path = os.path.join(project_path, "empty_folders_report.txt")
+    jsonl_path = os.path.join(project_path, "empty_folders_report.jsonl")
+    with james_core.ReportWriter(text_path, "Identified Empty Folders:", jsonl_path) as report:
+        for folder in empty_roots:
+            report.write(folder, folder, "identify", "empty")
+    return sum(os.path.getsize(path) for path in report.paths)
+
+
+def compare(results, previous_path):
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\nCompared with {previous_path}:")
+    for name, stage in results["stages"].items():
+        before = previous.get("stages", {}).get(name)
+        if before and stage["seconds"] > 0:
+            print(f"{name:<8} {before['seconds']:9.3f}s -> {stage['seconds']:9.3f}s  "
+                  f"(x{before['seconds'] / stage['seconds']:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--languages", type=int, default=40)
+    parser.add_argument("--populated-fraction", type=float, default=0.3,
+                        help="Fraction of leaf folders that get a file; the rest stay empty")
+    parser.add_argument("--workers", type=int, default=james_core.FOLDER_CREATION_WORKERS)
+    parser.add_argument("--scan-workers", type=int, default=james_core.SCAN_WORKERS)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Delay added to every filesystem call, to mimic a high-latency share")
+    parser.add_argument("--root", default=None, help="Folder to build the synthetic project in (default: temp)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=None, help="JSON result file (default: bench_suite_<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier JSON result to compare against")
+    args = parser.parse_args()
+
+    # Distinct first letters, so every language gets its own Med_Devices language code (aaXX, abXX, ...)
+    languages = [f"{string.ascii_lowercase[i // 26 % 26]}{string.ascii_lowercase[i % 26]}{i:03d}-XX"
+                 for i in range(args.languages)]
+    methodologies = list(james_core.METHODOLOGY_LAYOUTS)
+    project_path = tempfile.mkdtemp(prefix="bench_suite_", dir=args.root)
+    stages = {}
+    latency = args.latency_ms / 1000
+    try:
+        creation = run_stage(stages, "create", latency, james_core.create_folder_structure, project_path,
+                             languages, methodologies, max_workers=args.workers)
+        plan = james_core.build_folder_plan(languages, methodologies)
+        leaves, populated = populate_leaves(project_path, plan, args.populated_fraction, args.seed)
+
+        folder_counts = {}
+        empty_roots = run_stage(stages, "scan", latency, james_core.identify_empty_dirs, project_path,
+                                folder_counts=folder_counts, max_workers=args.scan_workers)
+        obsolete_dir = os.path.join(project_path, james_core.OBSOLETE_DIR_NAME)
+        os.makedirs(obsolete_dir, exist_ok=True)
+        moved, failed = run_stage(stages, "move", latency, james_core.move_empty_dirs, empty_roots, obsolete_dir)
+        report_bytes = run_stage(stages, "report", latency, write_reports, project_path, empty_roots)
+    finally:
+        shutil.rmtree(project_path, ignore_errors=True)
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": vars(args),
+        "tree": {
+            "folders": creation["planned"],
+            "leaves": leaves,
+            "populated_leaves": populated,
+            "empty_roots": len(empty_roots),
+            "empty_folders": sum(folder_counts.values()),
+            "moved": moved,
+            "failed": failed,
+            "report_bytes": report_bytes,
+        },
+        "stages": stages,
+    }
+    output = args.output or f"bench_suite_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n{creation['planned']:,} folders, {len(empty_roots):,} empty roots "
+          f"({sum(folder_counts.values()):,} folders) -> {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""Headless command line for scheduled jobs: `James.py create|clean|restore|watch|batch|templates|inventory ...`.
+
+Prints one JSON object per processed path on stdout. Never imports PySide6.
+"""
+import argparse
+import json
+import sys
+import time
+
+from james_core import (
+    BATCH_PROJECT_WORKERS, FOLDER_CREATION_WORKERS, SCAN_WORKERS, WATCH_POLL_INTERVAL, FolderWatcher,
+    ProjectInventory, RunMetrics, async_io_limit, create_folder_structure, find_move_journals, load_manifest,
+    load_methodology_templates, methodology_names, metrics_enabled, open_async_filesystem, parse_languages,
+    preview_empty_folder_deletion, preview_folder_creation, process_empty_folder_deletion_logic, provision_projects,
+    restore_obsolete_moves, template_directories
+)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="James.py", description="COA - Automation Tool (headless mode)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create", help="Create methodology folder structures")
+    create_parser.add_argument("paths", nargs="+", help="Project folders to create structures in")
+    create_parser.add_argument("-l", "--languages", required=True, help="Comma separated languages, e.g. enIN,de-DE")
+    create_parser.add_argument("-m", "--methodologies", required=True, help="Comma separated methodologies, e.g. Adapt,TEP")
+    create_parser.add_argument("--workers", type=int, default=FOLDER_CREATION_WORKERS,
+                               help="Concurrent mkdir calls per folder level (1 = serial)")
+    create_parser.add_argument("--no-skip-existing", dest="skip_existing", action="store_false",
+                               help="Issue mkdir for every planned folder instead of snapshotting the existing tree")
+    create_parser.add_argument("--dry-run", action="store_true",
+                               help="Only report the plan (counts per methodology, already present); create nothing")
+    create_parser.add_argument("--list-paths", action="store_true", help="With --dry-run, include every planned path")
+    create_parser.add_argument("--metrics", action="store_true",
+                               help="Include call counts, latency percentiles and stage times (also: JAMES_METRICS=1)")
+    create_parser.add_argument("--restart", dest="resume", action="store_false",
+                               help="Ignore the checkpoint of an unfinished run instead of resuming it")
+    create_parser.add_argument("--async-io", type=int, default=async_io_limit(), metavar="N",
+                               help="Run up to N filesystem calls at once on an asyncio loop; replaces --workers "
+                                    "(also: JAMES_ASYNC_IO=N)")
+
+    clean_parser = subparsers.add_parser("clean", help="Move empty folders into _Obsolete")
+    clean_parser.add_argument("paths", nargs="+", help="Project folders to clean")
+    clean_parser.add_argument("--jsonl", action="store_true",
+                              help="Also write each report as JSONL (path, action, status, duration)")
+    clean_parser.add_argument("--dry-run", action="store_true",
+                              help="Only list the empty roots and their folder counts; move nothing")
+    clean_parser.add_argument("--scan-workers", type=int, default=SCAN_WORKERS,
+                              help="Concurrent folder listings while scanning (1 = serial)")
+    clean_parser.add_argument("--cache", action="store_true",
+                              help="Reuse listings of folders unchanged since the last cached run")
+    clean_parser.add_argument("--rescan", action="store_true",
+                              help="Ignore the scan cache, list every folder and rebuild the cache")
+    clean_parser.add_argument("--metrics", action="store_true",
+                              help="Instrument the run and save cleanup_metrics.json next to the reports (also: JAMES_METRICS=1)")
+    clean_parser.add_argument("--async-io", type=int, default=async_io_limit(), metavar="N",
+                              help="Run up to N filesystem calls at once on an asyncio loop; replaces --scan-workers "
+                                   "(also: JAMES_ASYNC_IO=N)")
+
+    restore_parser = subparsers.add_parser("restore", help="Move folders from _Obsolete back using a cleanup's journal")
+    restore_parser.add_argument("paths", nargs="+", help="Cleaned project folders")
+    restore_parser.add_argument("--run", default=None,
+                                help="Run id of the cleanup to undo (default: the most recent one)")
+
+    watch_parser = subparsers.add_parser("watch", help="Keep a live emptiness index and print empty folders as they change")
+    watch_parser.add_argument("path", help="Project folder to watch")
+    watch_parser.add_argument("--names", default=None,
+                              help="Comma separated folder names to report, e.g. 01_toLing,02_fromLing,03_LLQA "
+                                   "(default: the empty roots a cleanup would move)")
+    watch_parser.add_argument("--interval", type=float, default=WATCH_POLL_INTERVAL,
+                              help="Seconds between checks for changes")
+    watch_parser.add_argument("--poll", action="store_true", help="Poll folder mtimes even if watchdog is installed")
+
+    batch_parser = subparsers.add_parser("batch", help="Provision every project listed in a manifest")
+    batch_parser.add_argument("manifest", help="CSV, JSON or YAML file of path/languages/methodologies rows")
+    batch_parser.add_argument("--parallel", type=int, default=BATCH_PROJECT_WORKERS,
+                              help="Projects provisioned at the same time")
+    batch_parser.add_argument("--workers", type=int, default=FOLDER_CREATION_WORKERS,
+                              help="Concurrent mkdir calls per folder level within a project (1 = serial)")
+    batch_parser.add_argument("--no-skip-existing", dest="skip_existing", action="store_false",
+                              help="Issue mkdir for every planned folder instead of snapshotting the existing tree")
+
+    subparsers.add_parser("templates", help="List the methodologies and validate the methodology templates")
+
+    inventory_parser = subparsers.add_parser("inventory", help="Index Work/06_Target and list stage x language status")
+    inventory_parser.add_argument("paths", nargs="+", help="Project folders to index")
+    inventory_parser.add_argument("--stage", default=None,
+                                  help="Stage pattern, e.g. 03_BT/02_fromLing or '*/02_fromLing'")
+    inventory_parser.add_argument("--methodology", default=None, help="Methodology pattern, e.g. FLV")
+    inventory_parser.add_argument("--language", default=None, help="Language pattern, e.g. 'de-*'")
+    empty_group = inventory_parser.add_mutually_exclusive_group()
+    empty_group.add_argument("--empty", dest="empty", action="store_const", const=True, default=None,
+                             help="Only stages without files")
+    empty_group.add_argument("--non-empty", dest="empty", action="store_const", const=False,
+                             help="Only stages with files")
+    inventory_parser.add_argument("--cached", action="store_true",
+                                  help="Answer from the saved index without walking the project")
+    inventory_parser.add_argument("--workers", type=int, default=SCAN_WORKERS,
+                                  help="Concurrent folder listings while indexing")
+    return parser
+
+
+def run_create(args, path):
+    languages = parse_languages(args.languages)
+    if not languages:
+        raise ValueError("Languages input is invalid.")
+    methodologies = parse_languages(args.methodologies)
+    if not methodologies:
+        raise ValueError("Please select at least one methodology.")
+    if args.dry_run:
+        preview = preview_folder_creation(path, languages, methodologies)
+        if not args.list_paths:
+            del preview["paths"]
+        return preview
+    with open_async_filesystem(args.async_io) as filesystem:
+        return create_folder_structure(path, languages, methodologies,
+                                       max_workers=args.workers, skip_existing=args.skip_existing,
+                                       metrics=RunMetrics("folder_creation") if args.metrics or metrics_enabled() else None,
+                                       resume=args.resume, filesystem=filesystem)
+
+
+def run_clean(args, path):
+    with open_async_filesystem(args.async_io) as filesystem:
+        if args.dry_run:
+            return preview_empty_folder_deletion(path, scan_workers=args.scan_workers, use_scan_cache=args.cache,
+                                                 filesystem=filesystem)
+        return process_empty_folder_deletion_logic(path, jsonl_report=args.jsonl, scan_workers=args.scan_workers,
+                                                   use_scan_cache=args.cache, force_rescan=args.rescan,
+                                                   metrics=RunMetrics("empty_folder_cleanup")
+                                                   if args.metrics or metrics_enabled() else None,
+                                                   filesystem=filesystem)
+
+
+def run_restore(args, path):
+    journals = find_move_journals(path)
+    if args.run:
+        journals = [journal for journal in journals if journal.endswith(f"{args.run}.jsonl")]
+    if not journals:
+        raise ValueError(f"No restore journal found in {path}.")
+    return restore_obsolete_moves(journals[0])
+
+
+def run_inventory(args, path):
+    inventory = ProjectInventory(path)
+    result = {"path": path}
+    if not args.cached:
+        result.update(inventory.refresh(max_workers=args.workers))
+        result["index"] = inventory.save()
+    elif inventory.updated is None:
+        raise ValueError(f"{path} has not been indexed yet; run without --cached first.")
+    result["updated"] = inventory.updated
+    result["rows"] = inventory.query(args.stage, args.methodology, args.language, args.empty)
+    return result
+
+
+def run_watch(args):
+    """Prints the empty folders whenever they change, until interrupted; returns the exit code."""
+    try:
+        watcher = FolderWatcher(args.path, args.interval, use_watchdog=not args.poll).start()
+    except (OSError, ValueError) as e:
+        print(json.dumps({"command": "watch", "path": args.path, "status": "error", "error": str(e)}))
+        return 1
+    names = set(parse_languages(args.names)) if args.names else None
+    previous = None
+    try:
+        while True:
+            empty = sorted(watcher.index.empty_folders(names) if names else watcher.index.empty_roots())
+            if empty != previous:
+                print(json.dumps({"command": "watch", "path": args.path, "backend": watcher.backend,
+                                  "folders": len(watcher.index), "empty": empty}), flush=True)
+                previous = empty
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.stop()
+
+
+def run_batch(args):
+    """Prints a line per project as it finishes, then one summary line; returns the exit code."""
+    try:
+        projects = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(json.dumps({"command": "batch", "manifest": args.manifest, "status": "error", "error": str(e)}))
+        return 1
+
+    def print_status(index, result):
+        print(json.dumps({"command": "batch", "index": index, **result}), flush=True)
+
+    summary = provision_projects(projects, args.parallel, args.workers, args.skip_existing, print_status)
+    del summary["results"]
+    print(json.dumps({"command": "batch", "manifest": args.manifest, "summary": summary}), flush=True)
+    return 1 if summary["failed"] else 0
+
+
+def run_templates(args):
+    """Reloads the methodology templates, prints the registry and any template errors; returns the exit code."""
+    errors = load_methodology_templates()
+    print(json.dumps({"command": "templates", "status": "error" if errors else "ok",
+                      "directories": template_directories(), "methodologies": methodology_names(),
+                      "errors": errors}))
+    return 1 if errors else 0
+
+
+COMMANDS = {"create": run_create, "clean": run_clean, "restore": run_restore, "inventory": run_inventory}
+
+
+def main(argv=None):
+    """Runs one command for every path and returns the process exit code (1 if any path failed)."""
+    args = build_parser().parse_args(argv)
+    if args.command == "batch":
+        return run_batch(args)
+    if args.command == "watch":
+        return run_watch(args)
+    if args.command == "templates":
+        return run_templates(args)
+
+    exit_code = 0
+    for path in args.paths:
+        try:
+            result = COMMANDS[args.command](args, path)
+            result["status"] = "ok"
+        except Exception as e:
+            result = {"path": path, "status": "error", "error": str(e)}
+            exit_code = 1
+        result["command"] = args.command
+        print(json.dumps(result), flush=True)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2709 @@
+"""Folder creation and empty folder cleanup logic shared by the GUI and the command line.
+
+This module must never import PySide6, so headless runs stay at interpreter-startup cost.
+"""
+import csv
+import errno
+import fnmatch
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import sqlite3
+import string
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager, nullcontext, suppress
+from datetime import datetime
+from functools import lru_cache
+
+# --- Script 1: Folder Creation Functions ---
+def create_directory(path):
+    """Creates a directory if it doesn't exist."""
+    os.makedirs(path, exist_ok=True)
+
+@lru_cache(maxsize=None)
+def get_language_code_med_devices(language):
+    """Extracts the first two lowercase and last two uppercase letters of a language (memoized)."""
+    if len(language) >= 4:
+        return f"{language[:2].lower()}{language[-2:].upper()}"
+    elif len(language) == 3:
+        return f"{language[:2].lower()}{language[-1:].upper()}"
+    elif len(language) == 2:
+        return f"{language.lower()}{language.upper()}"
+    else:
+        return "xxXX" # Default if language code is too short
+
+def get_current_date_code():
+    """Returns the current date inYYYY-MM-DD format."""
+    return datetime.now().strftime("%Y-%m-%d")
+
+def parse_languages(languages_str):
+    """Splits the comma separated languages input into a list of non-empty names."""
+    return [lang.strip() for lang in languages_str.split(',') if lang.strip()]
+
+# --- Language Registry ---
+LANGUAGE_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "language_registry.json")
+_LANGUAGE_TAG = re.compile(r"([a-z]{2,3})(?:-([a-z]{4}))?-?([a-z]{2}|[0-9]{3})?") # On keys: de-de, dede, sr-latn-rs
+_LANGUAGE_DISPLAY_NAME = re.compile(r"(.+)\((.+)\)") # german(germany)
+
+class LanguageRegistry:
+    """Canonical BCP-47 tags for the languages input, from the tables in language_registry.json.
+
+    resolve() accepts a tag in any common spelling (de-DE, de_DE, deDE, DE-de, sr-latn-rs), a
+    display name (German (Germany), German(Germany)) or an alias (Brazilian Portuguese) and
+    returns the canonical tag (de-DE, sr-Latn-RS, pt-BR) with a few dict lookups, or None if the
+    entry is unknown. Script subtags are kept, so sr-Latn-RS and sr-Cyrl-RS stay two languages.
+    """
+
+    def __init__(self, data):
+        self.languages = {code.lower(): name for code, name in data["languages"].items()}
+        self.regions = {code.upper(): name for code, name in data["regions"].items()}
+        self.locales = list(data.get("locales", []))
+        self._language_by_name = {self.key(name): code for code, name in self.languages.items()}
+        self._region_by_name = {self.key(name): code for code, name in self.regions.items()}
+        self._aliases = {self.key(alias): tag for alias, tag in data.get("aliases", {}).items()}
+
+    @staticmethod
+    def key(text):
+        """Lowercase without whitespace, with '_' as '-': the form every lookup table is keyed by."""
+        return "".join(text.split()).replace("_", "-").lower()
+
+    def _tag(self, language, script=None, region=None):
+        if language not in self.languages or (region is not None and region.upper() not in self.regions):
+            return None
+        return "-".join([language] + ([script.title()] if script else []) + ([region.upper()] if region else []))
+
+    def resolve(self, entry):
+        key = self.key(entry)
+        tag = self._aliases.get(key) or self._language_by_name.get(key)
+        if tag is not None:
+            return tag
+        match = _LANGUAGE_TAG.fullmatch(key)
+        if match:
+            return self._tag(*match.groups())
+        match = _LANGUAGE_DISPLAY_NAME.fullmatch(key)
+        if match:
+            language = self._language_by_name.get(match.group(1))
+            region = self._region_by_name.get(match.group(2))
+            if language is not None and region is not None:
+                return self._tag(language, region=region)
+        return None
+
+    def display_name(self, tag):
+        """"German (Germany)" for "de-DE"; the tag itself if it is not in the tables."""
+        language, _, region = tag.partition("-")
+        name = self.languages.get(language.lower())
+        if name is None:
+            return tag
+        return f"{name} ({self.regions[region.upper()]})" if region.upper() in self.regions else name
+
+    def suggestions(self):
+        """Completion entries: every listed locale as a tag and as a display name."""
+        return self.locales + [self.display_name(tag) for tag in self.locales]
+
+@lru_cache(maxsize=None)
+def language_registry():
+    """Loads the language registry on first use and keeps it for the rest of the process."""
+    with open(LANGUAGE_REGISTRY_PATH, encoding="utf-8") as f:
+        return LanguageRegistry(json.load(f))
+
+def dedupe_languages(languages):
+    """Drops repeated languages, keeping the first spelling of each in the order given.
+
+    Entries with the same BCP-47 tag are one language, so "deDE, de_de, German(Germany)" keeps
+    deDE. The kept spelling is the folder name, so projects created with enIN keep using enIN.
+    Unknown entries are deduped ignoring case and whitespace.
+    """
+    registry = language_registry()
+    first_spellings = {}
+    for language in languages:
+        first_spellings.setdefault(registry.resolve(language) or registry.key(language), language.strip())
+    return list(first_spellings.values())
+
+# --- Progress Reporting ---
+PROGRESS_EMIT_INTERVAL = 0.05 # Seconds between forwarded progress updates
+
+class ProgressChannel:
+    """Counts progress from any thread and forwards it, rate limited, as absolute values.
+
+    emit(stage, done, total, eta_seconds) is called at most once per PROGRESS_EMIT_INTERVAL,
+    plus once at the start of every stage and on finish(); eta_seconds is -1.0 while unknown.
+    Calling the channel with a count advances it, so it can be passed as a progress_callback.
+    """
+
+    def __init__(self, emit, interval=PROGRESS_EMIT_INTERVAL):
+        self._emit = emit
+        self._interval = interval
+        self._lock = threading.Lock()
+        self.stage = ""
+        self.done = 0
+        self.total = 0
+        self._started = self._last_emit = time.monotonic()
+
+    def start_stage(self, stage, total=0):
+        with self._lock:
+            self.stage = stage
+            self.done = 0
+            self.total = total
+            self._started = self._last_emit = time.monotonic()
+            update = self._snapshot(self._started)
+        self._emit(*update)
+
+    def advance(self, count=1):
+        with self._lock:
+            self.done += count
+            now = time.monotonic()
+            if now - self._last_emit < self._interval:
+                return
+            self._last_emit = now
+            update = self._snapshot(now)
+        self._emit(*update)
+
+    __call__ = advance
+
+    def finish(self):
+        with self._lock:
+            update = self._snapshot(time.monotonic())
+        self._emit(*update)
+
+    def _snapshot(self, now):
+        eta = -1.0
+        if self.done and self.total:
+            eta = (now - self._started) / self.done * max(self.total - self.done, 0)
+        return self.stage, self.done, self.total, eta
+
+# --- Run Instrumentation ---
+METRICS_ENV = "JAMES_METRICS" # Set to 1 to instrument runs started from the GUI
+METRICS_LOG_ENV = "JAMES_METRICS_LOG" # JSONL file every run summary is appended to, for aggregation
+METRICS_PERCENTILES = (50, 95, 99)
+METRICS_REPORT_NAME = "cleanup_metrics.json" # Written next to the cleanup reports
+
+def metrics_enabled():
+    return os.environ.get(METRICS_ENV, "") not in ("", "0")
+
+class RunMetrics:
+    """Call counts, latencies, stage times and bytes written for one run.
+
+    Instrumented functions take metrics=None and then skip every timing call, so disabled
+    instrumentation costs one None check per call site. Latencies are kept in flat arrays and
+    recorded from any thread.
+    """
+
+    def __init__(self, run):
+        self.run = run
+        self.stages = {}
+        self.bytes_written = 0
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._started_at = datetime.now().isoformat(timespec="seconds")
+        self._started = time.perf_counter()
+
+    def record(self, operation, seconds):
+        latencies = self._latencies.get(operation)
+        if latencies is None:
+            latencies = self._latencies.setdefault(operation, array('d'))
+        latencies.append(seconds)
+
+    def timed(self, operation, function):
+        """Returns function wrapped so that every call is recorded under operation."""
+        def timed_call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(operation, time.perf_counter() - started)
+        return timed_call
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def add_bytes(self, count):
+        with self._lock:
+            self.bytes_written += count
+
+    def summary(self, **context):
+        """Returns the run as a JSON-ready dict; context (path, counts, ...) is included as given."""
+        operations = {}
+        for operation, latencies in sorted(self._latencies.items()):
+            ordered = sorted(latencies)
+            stats = {"count": len(ordered), "total": round(sum(ordered), 6)}
+            for percentile in METRICS_PERCENTILES:
+                rank = max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)
+                stats[f"p{percentile}"] = round(ordered[rank], 6)
+            stats["max"] = round(ordered[-1], 6)
+            operations[operation] = stats
+        return {
+            "run": self.run,
+            "started": self._started_at,
+            "elapsed": round(time.perf_counter() - self._started, 6),
+            **context,
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "operations": operations,
+            "bytes_written": self.bytes_written,
+        }
+
+    def finish(self, json_path=None, **context):
+        """Builds the summary, writes it to json_path if given and appends it to JAMES_METRICS_LOG if set."""
+        summary = self.summary(**context)
+        if json_path is not None:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2)
+        log_path = os.environ.get(METRICS_LOG_ENV)
+        if log_path:
+            try:
+                with open(log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(summary) + "\n")
+            except OSError:
+                pass # Aggregation is best effort; the run itself succeeded
+        return summary
+
+def _stage(metrics, name):
+    """Times a stage when a RunMetrics is given, otherwise does nothing."""
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+def describe_metrics(summary):
+    """Formats a RunMetrics summary as short text lines for a completion dialog."""
+    lines = [f"Elapsed {summary['elapsed']:.2f} s: "
+             + ", ".join(f"{name} {seconds:.2f} s" for name, seconds in summary["stages"].items())]
+    for operation, stats in summary["operations"].items():
+        lines.append(f"{operation}: {stats['count']:,} calls, {stats['total']:.2f} s, p50 {stats['p50'] * 1000:.2f} ms, "
+                     f"p95 {stats['p95'] * 1000:.2f} ms, p99 {stats['p99'] * 1000:.2f} ms")
+    if summary["bytes_written"]:
+        lines.append(f"Written: {summary['bytes_written']:,} bytes")
+    return "\n".join(lines)
+
+# --- Filesystem Backends ---
+ASYNC_IO_ENV = "JAMES_ASYNC_IO" # Calls in flight for GUI runs; unset or 0 keeps plain blocking calls
+ASYNC_IO_MAX_IN_FLIGHT = 64 # Default concurrency limit of an AsyncFileSystem
+
+def async_io_limit():
+    try:
+        return max(int(os.environ.get(ASYNC_IO_ENV, "0")), 0)
+    except ValueError:
+        return 0
+
+class LocalFileSystem:
+    """Blocking operations on the local disk or a mounted share; the default backend.
+
+    A backend provides mkdir (raises FileExistsError), makedirs, isdir, list_directory
+    (returns (subdir paths, has_content) like _list_directory), subdirectory_names, move and
+    identity (a JSON-able value that changes when the folder is replaced or its listing
+    changes), each raising OSError on failure. Creation, scans and moves accept any backend through
+    their filesystem argument.
+    """
+
+    def mkdir(self, path):
+        os.mkdir(path)
+
+    def makedirs(self, path):
+        os.makedirs(path, exist_ok=True)
+
+    def isdir(self, path):
+        return os.path.isdir(path)
+
+    def list_directory(self, path):
+        return _list_directory(path)
+
+    def subdirectory_names(self, path):
+        with os.scandir(path) as entries:
+            return [entry.name for entry in entries if entry.is_dir()]
+
+    def move(self, source, dest):
+        _move_folder(source, dest)
+
+    def identity(self, path):
+        stat_result = os.stat(path)
+        return [stat_result.st_ino, stat_result.st_mtime_ns]
+
+LOCAL_FILESYSTEM = LocalFileSystem()
+
+class MemoryFileSystem:
+    """In-memory backend for fast, deterministic runs of creation, scans and moves.
+
+    Folders are absolute paths mapped to {name: is_folder} listings; add_file() places content.
+    It backs create_planned_folders, snapshot_existing_folders, identify_empty_dirs and
+    move_empty_dirs, and create_folder_structure writes no checkpoint for it; the cleanup entry
+    point still writes its reports and journal as local files.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(path)
+
+    def _listing(self, path):
+        entries = self._entries.get(path)
+        if entries is None:
+            parent = os.path.dirname(path)
+            if parent != path and self._entries.get(parent, {}).get(os.path.basename(path)) is False:
+                raise NotADirectoryError(errno.ENOTDIR, "Not a directory", path)
+            raise FileNotFoundError(errno.ENOENT, "No such directory", path)
+        return entries
+
+    def _add(self, path, is_folder):
+        parent = os.path.dirname(path)
+        if parent == path: # Filesystem root
+            self._entries.setdefault(path, {})
+            return
+        siblings = self._listing(parent)
+        if os.path.basename(path) in siblings:
+            raise FileExistsError(errno.EEXIST, "File exists", path)
+        siblings[os.path.basename(path)] = is_folder
+        if is_folder:
+            self._entries[path] = {}
+
+    def mkdir(self, path):
+        with self._lock:
+            self._add(self._key(path), True)
+
+    def makedirs(self, path):
+        path = self._key(path)
+        with self._lock:
+            missing = []
+            while path not in self._entries and os.path.dirname(path) != path:
+                missing.append(path)
+                path = os.path.dirname(path)
+            self._entries.setdefault(path, {})
+            for folder in reversed(missing):
+                self._add(folder, True)
+
+    def add_file(self, path):
+        """Creates an empty file, and any missing parent folders."""
+        path = self._key(path)
+        self.makedirs(os.path.dirname(path))
+        with self._lock:
+            self._add(path, False)
+
+    def isdir(self, path):
+        return self._key(path) in self._entries
+
+    def list_directory(self, path):
+        path = self._key(path)
+        with self._lock:
+            entries = self._listing(path)
+            subdirs = [os.path.join(path, name) for name, is_folder in entries.items()
+                       if is_folder and OBSOLETE_DIR_NAME not in name]
+            return subdirs, len(subdirs) < len(entries)
+
+    def subdirectory_names(self, path):
+        with self._lock:
+            return [name for name, is_folder in self._listing(self._key(path)).items() if is_folder]
+
+    def move(self, source, dest):
+        source, dest = self._key(source), self._key(dest)
+        with self._lock:
+            self._listing(source)
+            destination_parent = self._listing(os.path.dirname(dest))
+            if os.path.basename(dest) in destination_parent:
+                raise FileExistsError(errno.EEXIST, "File exists", dest)
+            if dest == source or dest.startswith(os.path.join(source, "")):
+                raise OSError(errno.EINVAL, "Cannot move a folder into itself", dest)
+            del self._entries[os.path.dirname(source)][os.path.basename(source)]
+            destination_parent[os.path.basename(dest)] = True
+            prefix = os.path.join(source, "")
+            for path in [path for path in self._entries if path == source or path.startswith(prefix)]:
+                self._entries[dest + path[len(source):]] = self._entries.pop(path)
+
+    def identity(self, path):
+        # A listing dict moves with its folder, so its id stands in for the inode
+        with self._lock:
+            entries = self._listing(self._key(path))
+            return [id(entries), len(entries)]
+
+    def folders(self):
+        """Returns every folder path, sorted."""
+        with self._lock:
+            return sorted(self._entries)
+
+class AsyncFileSystem:
+    """Runs a blocking backend's operations as asyncio tasks, up to max_in_flight at once.
+
+    Creation, scans and moves given an AsyncFileSystem drive its event loop in the calling
+    (worker) thread. Each blocking call runs on the instance's own pool of max_in_flight threads,
+    so on a high-latency share hundreds of mkdir/scandir/rename round trips can be pending
+    together. Use it from one thread at a time and close() it when done, or use it in a with block.
+    """
+
+    def __init__(self, filesystem=None, max_in_flight=ASYNC_IO_MAX_IN_FLIGHT):
+        self.filesystem = filesystem if filesystem is not None else LOCAL_FILESYSTEM
+        self.max_in_flight = max(max_in_flight, 1)
+        self._loop = None
+        self._executor = None
+        self._limit = None
+
+    def execute(self, coroutine):
+        """Runs coroutine to completion on this instance's event loop and returns its result."""
+        import asyncio # Only async runs pay for it; blocking runs never import it
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="async-io")
+            self._limit = asyncio.Semaphore(self.max_in_flight)
+        return self._loop.run_until_complete(coroutine)
+
+    async def run(self, function, *args):
+        """Awaits function(*args) on the thread pool once fewer than max_in_flight calls are pending."""
+        async with self._limit:
+            return await self._loop.run_in_executor(self._executor, function, *args)
+
+    def close(self):
+        if self._loop is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._loop.close()
+            self._loop = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def open_async_filesystem(max_in_flight):
+    """Returns a context manager yielding an AsyncFileSystem over the local disk, or None for
+    plain blocking calls when max_in_flight is 0."""
+    return AsyncFileSystem(max_in_flight=max_in_flight) if max_in_flight > 0 else nullcontext()
+
+def _backends(filesystem):
+    """Splits a filesystem argument into (blocking backend, AsyncFileSystem or None)."""
+    if isinstance(filesystem, AsyncFileSystem):
+        return filesystem.filesystem, filesystem
+    return (filesystem if filesystem is not None else LOCAL_FILESYSTEM), None
+
+async def _run_bounded(async_filesystem, function, frontier, on_result, should_stop=None):
+    """Calls function(item) on async_filesystem for items popped from the frontier list.
+
+    Keeps SCAN_QUEUE_FACTOR * max_in_flight calls pending; on_result(item, result) runs on the
+    event loop in completion order and may push more items onto the frontier. Stops submitting
+    once should_stop() is true, but every call already submitted still finishes and reaches
+    on_result: a rename running on the thread pool cannot be called back, so its outcome must be
+    recorded. Only an exception cancels what is pending.
+    """
+    import asyncio # Already loaded by AsyncFileSystem.execute, which runs this coroutine
+    queue_limit = async_filesystem.max_in_flight * SCAN_QUEUE_FACTOR
+    pending = {}
+    stopping = False
+    try:
+        while pending or (frontier and not stopping):
+            stopping = stopping or (should_stop is not None and should_stop())
+            while frontier and not stopping and len(pending) < queue_limit:
+                item = frontier.pop()
+                pending[asyncio.ensure_future(async_filesystem.run(function, item))] = item
+            if not pending:
+                break
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                on_result(pending.pop(task), task.result())
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+# --- Methodology Layout Registry ---
+# Each layout is a folder tree: a dict maps a folder name to its subfolders. Names may use the
+# placeholders {language}, {lang_code} and {date_code}, filled in per language when a plan is built.
+FOLDER_CREATION_WORKERS = 8 # Concurrent mkdir calls per depth level; 1 creates serially
+CREATION_RETRIES = 3 # Extra attempts for a mkdir that fails with one of CREATION_RETRY_ERRNOS
+CREATION_RETRY_DELAY = 0.5 # Seconds before the first retry, doubled for each further one
+CREATION_RETRY_ERRNOS = frozenset((errno.ETIMEDOUT, errno.EIO, errno.ESTALE, errno.ECONNRESET, errno.EAGAIN,
+                                   errno.EBUSY)) # Network blips worth retrying; anything else fails at once
+CREATION_STATE_NAME = ".james_creation_state.jsonl" # Checkpoint of an unfinished creation run
+
+def _subfolders(*names, children=None):
+    """Returns a layout level where every named folder shares the same subfolders."""
+    return {name: children or {} for name in names}
+
+LING_SUBFOLDERS = _subfolders("01_toLing", "02_fromLing", "03_LLQA")
+TOLING_FROMLING = _subfolders("01_toLing", "02_fromLing")
+TOPOST_FROMPOST = _subfolders("01_toPost", "02_fromPost")
+
+BASE_LAYOUT = {
+    "Work": {
+        "01_Source": {},
+        "02_Prep": _subfolders("01_toDTP-ENG", "02_fromDTP-ENG", "03_SegQA"),
+        "03_Mapping": {},
+        "04_Mapping_Review": {},
+        "05_Legacy_Analysis": _subfolders("01_toCleanUp", "02_CleanedUp", "03_TMX-Create"),
+        "06_Target": {},
+    }
+}
+
+def _target_layout(methodology, subfolders):
+    """Returns the base 'Work' skeleton plus Work/06_Target/<language>/<methodology>/..."""
+    return (BASE_LAYOUT, {"Work": {"06_Target": {"{language}": {methodology: subfolders}}}})
+
+METHODOLOGY_LAYOUTS = {
+    "Adapt": _target_layout("Adapt", {
+        "01_Adapt": TOLING_FROMLING,
+        "02_LLQA": {},
+        "03_Post": TOPOST_FROMPOST,
+        **_subfolders("04_Final_QA", "05_Final_PM", "06_TM_Update"),
+    }),
+    "TEP": _target_layout("TEP", {
+        "01_Trans": TOLING_FROMLING,
+        "02_Edit": TOLING_FROMLING,
+        "03_LLQA": {},
+        "05_Post": TOPOST_FROMPOST,
+        **_subfolders("06_Final_QA", "07_Final_PM", "08_TM_Update"),
+    }),
+    "LV": _target_layout("LV", {
+        **_subfolders("01a_FT1", "01b_FT2", "02_Rec1", "03_BT", "04_CR",
+                      "05_Rec2", "06_SME_Review", "07_Rec3", children=LING_SUBFOLDERS),
+        "08_Post": {},
+        **_subfolders("09_LSO", "10_CogDeb", "11_Rec4", children=LING_SUBFOLDERS),
+        **_subfolders("12_Final_QA", "13_Final_PM", "14_TM_Update"),
+    }),
+    "FTBT": _target_layout("FTBT", {
+        **_subfolders("01_FT", "02_BT", "03_CR", "04_CRI", children=LING_SUBFOLDERS),
+        "05_Post": {},
+        "06_LSO": LING_SUBFOLDERS,
+        **_subfolders("07_Final_QA", "08_Final_PM", "09_TM_Update"),
+    }),
+    "Migration": _target_layout("Migration", {
+        **_subfolders("01_Mig", "02_MigQA", children=LING_SUBFOLDERS),
+        "03_Post": {},
+        **_subfolders("04_SSR1", "05_SSR2", "06_SSR3", children=LING_SUBFOLDERS),
+        "x_Approved": {},
+    }),
+    "FLV": _target_layout("FLV", {
+        **_subfolders("01a_FT1", "01b_FT2", "02_Rec1", "03_BT", "04_CR", "05_Rec2",
+                      "06_Expert_Review", "07_Rec3", "08_SME_Review", "09_Rec4", children=LING_SUBFOLDERS),
+        "10_Post": {},
+    }),
+    "Med_Devices": ({
+        "Work": _subfolders("01_Source", "02_Prep", "03_Trans", "04_Revision", "05_Post",
+                            "06_Final_QA", "07_Final_PM", "xx_ICR", "xx_ICR_imp",
+                            children={"{date_code}_{lang_code}": {"{language}": {}}}),
+    },),
+    "CogDeb": _target_layout("CogDeb", {
+        **_subfolders("01a_FT1", "01b_FT2", "02_Rec1", "03_BT", "04_CR", "05_Rec2", children=LING_SUBFOLDERS),
+        "06_Post": {},
+        **_subfolders("07_LSO", "08_CogDeb", "09_Rec4", children=LING_SUBFOLDERS),
+        **_subfolders("10_Final_QA", "11_Final_PM", "12_TM_Update"),
+    }),
+}
+
+_METHODOLOGY_NAMES = {name.lower(): name for name in METHODOLOGY_LAYOUTS}
+_compiled_layouts = {}
+
+# --- Methodology Templates ---
+# Extra or client-specific layouts live in JSON/YAML files named <methodology>.json|.yaml|.yml, read
+# from methodology_templates/ next to this module and any folders listed in JAMES_TEMPLATE_DIRS.
+# A template has a "target" tree (added under Work/06_Target/{language}/<methodology>/ on top of the
+# Work skeleton, like the built-in layouts), a "layout" tree of its own, or both. A template
+# named like a built-in methodology (in any case) replaces it under the built-in's spelling and
+# place in the list. Compiled plans are cached per template hash.
+TEMPLATE_DIRS_ENV = "JAMES_TEMPLATE_DIRS"
+TEMPLATE_CACHE_ENV = "JAMES_TEMPLATE_CACHE"
+DEFAULT_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "methodology_templates")
+DEFAULT_TEMPLATE_CACHE = os.path.join(os.path.expanduser("~"), ".james", "template_cache.json")
+TEMPLATE_EXTENSIONS = (".json", ".yaml", ".yml")
+TEMPLATE_KEYS = ("target", "layout")
+TEMPLATE_PLACEHOLDERS = {"language", "lang_code", "date_code"}
+TEMPLATE_CACHE_VERSION = 1
+_INVALID_FOLDER_CHARACTERS = set('<>:"/\\|?*')
+
+_template_lock = threading.Lock()
+_template_names = None # Template methodology names in load order, once loaded
+_template_errors = []
+
+def template_directories():
+    """Returns the folders searched for methodology templates, in load order."""
+    extra = [folder for folder in os.environ.get(TEMPLATE_DIRS_ENV, "").split(os.pathsep) if folder]
+    return [DEFAULT_TEMPLATE_DIR] + extra
+
+def _validate_tree(tree, where):
+    """Checks one template tree and returns it as nested dicts; a list is a level of leaf folders."""
+    if tree is None:
+        return {}
+    if isinstance(tree, list):
+        tree = dict.fromkeys(tree)
+    if not isinstance(tree, dict):
+        raise ValueError(f"{where}: expected a mapping of folder names, got {type(tree).__name__}")
+    validated = {}
+    for name, children in tree.items():
+        if not isinstance(name, str) or not name.strip() or name in (".", ".."):
+            raise ValueError(f"{where}: invalid folder name {name!r}")
+        bad_characters = _INVALID_FOLDER_CHARACTERS.intersection(name)
+        if bad_characters:
+            raise ValueError(f"{where}: folder name {name!r} contains {''.join(sorted(bad_characters))!r}")
+        try:
+            fields = {field for _, field, _, _ in string.Formatter().parse(name) if field is not None}
+        except ValueError as e:
+            raise ValueError(f"{where}: folder name {name!r}: {e}") from None
+        if not fields <= TEMPLATE_PLACEHOLDERS:
+            raise ValueError(f"{where}: folder name {name!r} uses unknown placeholders "
+                             f"{sorted(fields - TEMPLATE_PLACEHOLDERS)} (use {sorted(TEMPLATE_PLACEHOLDERS)})")
+        validated[name] = _validate_tree(children, f"{where}/{name}")
+    return validated
+
+def _parse_template(template_path, data):
+    """Parses a template file's bytes and returns its validated layout trees."""
+    if template_path.lower().endswith(".json"):
+        template = json.loads(data.decode('utf-8-sig'))
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML templates need the PyYAML package (pip install pyyaml).") from None
+        template = yaml.safe_load(data)
+    if not isinstance(template, dict) or not template:
+        raise ValueError("a template must be a mapping with 'target' and/or 'layout'")
+    unknown = set(template) - set(TEMPLATE_KEYS)
+    if unknown:
+        raise ValueError(f"unknown keys {sorted(unknown)} (expected {list(TEMPLATE_KEYS)})")
+    return {key: _validate_tree(template[key], key) for key in TEMPLATE_KEYS if key in template}
+
+def _compile_trees(trees):
+    """Returns (static_paths, language_templates) for layout trees, parents before children."""
+    paths = {}
+    for tree in trees:
+        for parts in _flatten_layout(tree):
+            paths.setdefault(os.path.join(*parts), None)
+    static_paths = [path for path in paths if "{" not in path]
+    language_templates = [path for path in paths if "{" in path]
+    return static_paths, language_templates
+
+def _compile_template(name, template_path, data):
+    trees = _parse_template(template_path, data)
+    layout = ()
+    if "target" in trees:
+        layout += _target_layout(name, trees["target"])
+    if "layout" in trees:
+        layout += (trees["layout"],)
+    return _compile_trees(layout)
+
+def _read_template_cache(cache_path):
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != TEMPLATE_CACHE_VERSION or cache.get("sep") != os.sep:
+        return {}
+    return cache.get("plans", {})
+
+def _write_template_cache(cache_path, plans):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": TEMPLATE_CACHE_VERSION, "sep": os.sep, "plans": plans}, f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass # The cache only saves time; the next start compiles again
+
+def load_methodology_templates(directories=None, cache_path=None):
+    """Registers every template in directories (default: template_directories()) as a methodology.
+
+    Each file is hashed; a plan compiled earlier from identical bytes is taken from the cache at
+    cache_path (default JAMES_TEMPLATE_CACHE or ~/.james/template_cache.json) instead of being
+    parsed, validated and compiled again. Invalid templates are skipped. Returns the list of
+    "<file>: <problem>" errors, also available from methodology_template_errors().
+    """
+    global _template_names
+    cache_path = cache_path or os.environ.get(TEMPLATE_CACHE_ENV) or DEFAULT_TEMPLATE_CACHE
+    builtin_names = {name.lower(): name for name in METHODOLOGY_LAYOUTS}
+    with _template_lock:
+        cached_plans = _read_template_cache(cache_path)
+        plans = {}
+        names = {}
+        errors = []
+        for directory in (template_directories() if directories is None else directories):
+            try:
+                file_names = sorted(os.listdir(directory))
+            except OSError:
+                continue
+            for file_name in file_names:
+                name, extension = os.path.splitext(file_name)
+                if extension.lower() not in TEMPLATE_EXTENSIONS:
+                    continue
+                name = builtin_names.get(name.lower(), name) # adapt.json replaces Adapt, still named Adapt
+                template_path = os.path.join(directory, file_name)
+                try:
+                    with open(template_path, 'rb') as f:
+                        data = f.read()
+                    digest = hashlib.sha256(name.encode('utf-8') + b"\0" + data).hexdigest()
+                    plan = cached_plans.get(digest) or plans.get(digest)
+                    if plan is None:
+                        plan = list(_compile_template(name, template_path, data))
+                    plans[digest] = plan
+                except Exception as e: # Unreadable, unparsable (JSON or YAML) or invalid
+                    errors.append(f"{template_path}: {e}")
+                    continue
+                names.pop(name.lower(), None) # A later folder overrides an earlier one
+                names[name.lower()] = (name, plan)
+
+        _METHODOLOGY_NAMES.clear()
+        _METHODOLOGY_NAMES.update(builtin_names)
+        _compiled_layouts.clear()
+        for key, (name, plan) in names.items():
+            _METHODOLOGY_NAMES[key] = name # Replacing a built-in keeps its place in the list
+            _compiled_layouts[name] = (plan[0], plan[1])
+        _template_names = [name for name, _ in names.values()]
+        _template_errors[:] = errors
+        if plans != cached_plans:
+            _write_template_cache(cache_path, plans)
+        return list(errors)
+
+def _ensure_templates_loaded():
+    if _template_names is None:
+        load_methodology_templates()
+
+def methodology_names():
+    """Returns every registered methodology: built-ins first, then templates in load order."""
+    _ensure_templates_loaded()
+    names = list(_METHODOLOGY_NAMES.values())
+    return [name for name in names if name in METHODOLOGY_LAYOUTS] + \
+           [name for name in names if name not in METHODOLOGY_LAYOUTS]
+
+def methodology_template_errors():
+    """Returns the problems found in the methodology templates, one "<file>: <problem>" each."""
+    _ensure_templates_loaded()
+    return list(_template_errors)
+
+def _flatten_layout(tree, prefix=()):
+    """Yields every folder of a layout tree as a tuple of names, parents before children."""
+    for name, children in tree.items():
+        path = prefix + (name,)
+        yield path
+        yield from _flatten_layout(children, path)
+
+def methodology_name(methodology):
+    """Returns the registered spelling of a methodology (case-insensitive); raises ValueError if unknown."""
+    _ensure_templates_loaded()
+    name = _METHODOLOGY_NAMES.get(methodology.lower())
+    if name is None:
+        raise ValueError(f"Unknown methodology: {methodology}")
+    return name
+
+def compile_layout(methodology):
+    """Returns (static_paths, language_templates) for a methodology, compiled once and cached.
+
+    Both are deduplicated, parent-before-child lists of paths relative to the project folder.
+    Template methodologies are compiled when the templates are loaded.
+    """
+    name = methodology_name(methodology)
+    if name not in _compiled_layouts:
+        _compiled_layouts[name] = _compile_trees(METHODOLOGY_LAYOUTS[name])
+    return _compiled_layouts[name]
+
+def language_code_collisions(languages, methodologies):
+    """Returns {lang_code: [languages]} for distinct languages that would share a {lang_code} folder.
+
+    Only methodologies whose layouts use {lang_code} (Med_Devices) are affected, e.g. "enUS"
+    and "en-US" both map to the "<date>_enUS" bucket. The layout nests a {language} folder in
+    each bucket, so colliding languages still get their own folders; the collision is reported
+    as a warning. Empty when there is no collision.
+    """
+    if not any("{lang_code}" in template for methodology in methodologies
+               for template in compile_layout(methodology)[1]):
+        return {}
+    by_code = {}
+    for language in dict.fromkeys(languages):
+        by_code.setdefault(get_language_code_med_devices(language), []).append(language)
+    return {code: shared for code, shared in by_code.items() if len(shared) > 1}
+
+def plan_creation_units(languages, methodologies, date_code=None):
+    """Splits the folder plan into ((methodology, language), relative paths) units, in creation order.
+
+    Each methodology's language-independent folders form a (methodology, "") unit ahead of its
+    language units. Every path appears once, in the first unit that needs it, after its parent.
+    date_code defaults to today and is fixed for the whole plan, so a run crossing midnight never
+    splits its date buckets; a resumed run passes the date of the run it continues.
+    """
+    date_code = date_code or get_current_date_code()
+    lang_codes = {language: get_language_code_med_devices(language) for language in languages}
+    seen = set()
+    units = []
+
+    def new_paths(paths):
+        fresh = [path for path in paths if path not in seen]
+        seen.update(fresh)
+        return fresh
+
+    for methodology in methodologies:
+        name = methodology_name(methodology)
+        static_paths, language_templates = compile_layout(name)
+        units.append(((name, ""), new_paths(static_paths)))
+        for language in languages:
+            units.append(((name, language), new_paths(
+                template.format(language=language, lang_code=lang_codes[language], date_code=date_code)
+                for template in language_templates)))
+    return units
+
+def build_folder_plan(languages, methodologies, date_code=None):
+    """Merges the layouts of all methodologies and languages into one ordered, duplicate-free list."""
+    return [path for _, paths in plan_creation_units(languages, methodologies, date_code) for path in paths]
+
+def _make_planned_directory(full_path, filesystem=LOCAL_FILESYSTEM):
+    """Creates one planned folder whose parent already exists; returns False if it was already there."""
+    try:
+        filesystem.mkdir(full_path)
+    except FileExistsError:
+        return False
+    return True
+
+def _make_directory_with_retry(full_path, filesystem=LOCAL_FILESYSTEM):
+    """_make_planned_directory, retried with exponential backoff on transient OSErrors (network blips).
+
+    Only the errnos in CREATION_RETRY_ERRNOS are retried; a full disk, a bad name or a missing
+    parent raises at once.
+    """
+    delay = CREATION_RETRY_DELAY
+    for _ in range(CREATION_RETRIES):
+        try:
+            return _make_planned_directory(full_path, filesystem)
+        except OSError as e:
+            if e.errno not in CREATION_RETRY_ERRNOS:
+                raise
+            time.sleep(delay)
+            delay *= 2
+    return _make_planned_directory(full_path, filesystem)
+
+def snapshot_existing_folders(path, relative_paths, filesystem=None):
+    """Returns the planned folders that already exist under path.
+
+    Only existing planned folders that have planned children are listed, one listing each,
+    so a missing branch costs nothing and unrelated content is never walked. With an
+    AsyncFileSystem the listings of a level overlap.
+    """
+    backend, async_filesystem = _backends(filesystem)
+    planned = set(relative_paths)
+    planned_parents = {os.path.dirname(relative_path) for relative_path in planned}
+    existing = set()
+    stack = [""]
+
+    def list_planned(relative_dir):
+        try:
+            names = backend.subdirectory_names(os.path.join(path, relative_dir))
+        except OSError:
+            return []
+        children = (os.path.join(relative_dir, name) if relative_dir else name for name in names)
+        return [child for child in children if child in planned]
+
+    def add_existing(relative_dir, children):
+        existing.update(children)
+        stack.extend(child for child in children if child in planned_parents)
+
+    if async_filesystem is not None:
+        async_filesystem.execute(_run_bounded(async_filesystem, list_planned, stack, add_existing))
+    while stack:
+        relative_dir = stack.pop()
+        add_existing(relative_dir, list_planned(relative_dir))
+    return existing
+
+def group_plan_by_depth(relative_paths):
+    """Splits a plan into levels of equal depth, shallowest first."""
+    levels = {}
+    for relative_path in relative_paths:
+        levels.setdefault(relative_path.count(os.sep), []).append(relative_path)
+    return [levels[depth] for depth in sorted(levels)]
+
+def create_planned_folders(path, relative_paths, progress_callback=None, max_workers=FOLDER_CREATION_WORKERS,
+                           metrics=None, executor=None, filesystem=None, folder_callback=None):
+    """Creates every planned folder under path in a single pass.
+
+    With max_workers > 1 each depth level is created concurrently by a bounded thread pool and
+    finishes before the next level starts; with max_workers <= 1 the plan is created serially.
+    A caller creating several plans in a row can pass its own executor to reuse the threads.
+    With an AsyncFileSystem its concurrency limit replaces max_workers and executor.
+    Transient mkdir failures are retried with backoff. progress_callback(1) is called per folder
+    handled; pass a ProgressChannel to rate limit it. folder_callback(relative_path) is called
+    as each folder is handled. With a RunMetrics every mkdir is timed.
+    Returns the number of folders that were actually created.
+    """
+    backend, async_filesystem = _backends(filesystem)
+    backend.makedirs(path)
+
+    def make_directory(relative_path):
+        return _make_directory_with_retry(os.path.join(path, relative_path), backend)
+
+    if metrics is not None:
+        make_directory = metrics.timed("mkdir", make_directory)
+    created = 0
+    own_executor = None
+
+    def count_created(relative_path, was_created):
+        nonlocal created
+        created += was_created
+        if progress_callback is not None:
+            progress_callback(1)
+        if folder_callback is not None:
+            folder_callback(relative_path)
+
+    if async_filesystem is not None:
+        for level in group_plan_by_depth(relative_paths):
+            async_filesystem.execute(_run_bounded(async_filesystem, make_directory, list(level), count_created))
+        return created
+    if max_workers <= 1:
+        completed = ((relative_path, make_directory(relative_path)) for relative_path in relative_paths)
+    else:
+        if executor is None:
+            executor = own_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="folder-creation")
+        completed = (
+            pair
+            for level in group_plan_by_depth(relative_paths)
+            for pair in zip(level, executor.map(make_directory, level))
+        )
+    try:
+        for relative_path, was_created in completed:
+            count_created(relative_path, was_created)
+    finally:
+        if own_executor is not None:
+            own_executor.shutdown(cancel_futures=True)
+    return created
+
+def read_creation_state(path):
+    """Reads the checkpoint an unfinished creation run left in path.
+
+    Returns None when there is none, otherwise a dict with the run's languages, methodologies,
+    date_code and started time plus its completed (methodology, language) units. A line cut
+    short by a crash is ignored, so that unit is simply redone.
+    """
+    try:
+        with open(os.path.join(path, CREATION_STATE_NAME), encoding="utf-8") as f:
+            return _parse_creation_state(f.read())
+    except OSError:
+        return None
+
+def _parse_creation_state(text):
+    records = []
+    for line in text.splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    if not records or not isinstance(records[0], dict) or "date_code" not in records[0]:
+        return None
+    state = dict(records[0])
+    state["completed"] = [tuple(record["unit"]) for record in records[1:]
+                          if isinstance(record, dict) and "unit" in record]
+    return state
+
+def _open_creation_state(path):
+    """Opens and exclusively locks path's checkpoint, so two runs on one project can't share it.
+
+    The lock is released by the OS if the run dies. Raises ValueError while another run holds it.
+    """
+    state_path = os.path.join(path, CREATION_STATE_NAME)
+    while True:
+        state_file = open(state_path, "a+", encoding="utf-8")
+        try:
+            state_file.seek(0)
+            if os.name == "nt":
+                import msvcrt
+                msvcrt.locking(state_file.fileno(), msvcrt.LK_NBLCK, 1)
+                return state_file
+            import fcntl
+            fcntl.flock(state_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            if os.path.samestat(os.fstat(state_file.fileno()), os.stat(state_path)):
+                return state_file
+        except OSError:
+            state_file.close()
+            raise ValueError(f"Another folder creation run is already working in {path}.") from None
+        state_file.close() # Removed by the run that held it just before the lock was taken: open again
+
+def _close_creation_state(state_file, finished):
+    """Unlocks the checkpoint; a finished run removes it first, tolerating one already gone."""
+    state_path = state_file.name
+    if finished and os.name != "nt":
+        with suppress(FileNotFoundError):
+            os.remove(state_path) # Still locked, so no other run can be using this file
+    state_file.close()
+    if finished and os.name == "nt":
+        with suppress(OSError):
+            os.remove(state_path) # Windows removes only closed files; another run may hold it by now
+
+def create_folder_structure(path, languages, methodologies, progress_callback=None,
+                            max_workers=FOLDER_CREATION_WORKERS, skip_existing=True, plan_callback=None,
+                            metrics=None, resume=True, filesystem=None):
+    """Plans and creates the folder structure for every language and methodology under path.
+
+    Every finished (methodology, language) unit is checkpointed to CREATION_STATE_NAME in path,
+    which is removed once the whole run succeeds; the file stays locked meanwhile, so a second run
+    on the same path raises ValueError instead of overwriting it. If a run fails partway, a rerun
+    with the same languages and methodologies resumes it: finished units are skipped and the
+    original date code is kept. resume=False starts over. filesystem selects the backend; only
+    local runs are checkpointed. Repeated languages are dropped first (see
+    dedupe_languages). Raises ValueError for an unknown methodology. Languages sharing a
+    language code folder are returned under "code_collisions" (see language_code_collisions).
+    plan_callback(count) is told how many folders will be created before creation starts.
+    Returns a dict describing the run, which with a RunMetrics includes its summary under "metrics".
+    """
+    languages, methodologies = dedupe_languages(languages), list(methodologies)
+    for methodology in methodologies:
+        methodology_name(methodology) # Unknown methodologies fail before anything is created
+    backend = _backends(filesystem)[0]
+    checkpointed = backend is LOCAL_FILESYSTEM
+    backend.makedirs(path)
+    state_file = _open_creation_state(path) if checkpointed else None
+    finished = False
+    try:
+        result = _create_checkpointed(path, languages, methodologies, progress_callback, max_workers, skip_existing,
+                                      plan_callback, metrics, resume, filesystem, state_file)
+        finished = True
+    finally:
+        if state_file is not None:
+            _close_creation_state(state_file, finished)
+    if metrics is not None:
+        result["metrics"] = metrics.finish(**result)
+    return result
+
+def _create_checkpointed(path, languages, methodologies, progress_callback, max_workers, skip_existing,
+                         plan_callback, metrics, resume, filesystem, state_file):
+    """create_folder_structure once path exists and its checkpoint (state_file, or None) is locked."""
+    state = None
+    if state_file is not None and resume:
+        state_file.seek(0)
+        state = _parse_creation_state(state_file.read())
+    if state is not None and (state.get("languages"), state.get("methodologies")) != (languages, methodologies):
+        state = None
+    date_code = state["date_code"] if state is not None else get_current_date_code()
+    completed_units = set(state["completed"]) if state is not None else set()
+
+    with _stage(metrics, "plan"):
+        units = plan_creation_units(languages, methodologies, date_code)
+        pending = [(unit, paths) for unit, paths in units if unit not in completed_units]
+        planned = sum(len(paths) for _, paths in units)
+
+    # Incremental mode: one snapshot of the existing tree, then mkdir only what is missing
+    with _stage(metrics, "snapshot"):
+        if skip_existing:
+            existing = snapshot_existing_folders(path, [relative_path for _, paths in pending for relative_path in paths],
+                                                 filesystem)
+            pending = [(unit, [relative_path for relative_path in paths if relative_path not in existing])
+                       for unit, paths in pending]
+
+    if plan_callback is not None:
+        plan_callback(sum(len(paths) for _, paths in pending))
+
+    # All units are created together, level by level; a unit is checkpointed once its last folder is done
+    remaining = {unit: len(paths) for unit, paths in pending}
+    unit_of = {relative_path: unit for unit, paths in pending for relative_path in paths}
+
+    def checkpoint(unit):
+        if state_file is not None:
+            state_file.write(json.dumps({"unit": list(unit)}) + "\n")
+            state_file.flush()
+
+    def folder_done(relative_path):
+        unit = unit_of[relative_path]
+        remaining[unit] -= 1
+        if not remaining[unit]:
+            checkpoint(unit)
+
+    with _stage(metrics, "create"):
+        if state_file is not None and state is None:
+            state_file.truncate(0)
+            state_file.write(json.dumps({"languages": languages, "methodologies": methodologies,
+                                         "date_code": date_code, "started": datetime.now().isoformat()}) + "\n")
+            state_file.flush()
+        for unit, paths in pending:
+            if not paths:
+                checkpoint(unit)
+        created = create_planned_folders(path, [relative_path for _, paths in pending for relative_path in paths],
+                                         progress_callback, max_workers, metrics, filesystem=filesystem,
+                                         folder_callback=folder_done)
+    return {"path": path, "planned": planned, "created": created, "existing": planned - created,
+            "resumed": state is not None, "skipped_units": len(units) - len(pending),
+            "code_collisions": language_code_collisions(languages, methodologies)}
+
+
+def preview_folder_creation(path, languages, methodologies, check_existing=True):
+    """Dry run of create_folder_structure: computes the plan without creating anything.
+
+    Returns the planned paths, the folder count per methodology, any language code collisions
+    (a warning; see language_code_collisions) and, when check_existing is true and path exists, how
+    many planned folders are already present (read-only scandir). Languages are deduped as for a
+    real run and returned under "languages".
+    """
+    languages = dedupe_languages(languages)
+    plan = {}
+    per_methodology = {}
+    for methodology in methodologies:
+        methodology_plan = build_folder_plan(languages, [methodology])
+        per_methodology[methodology_name(methodology)] = len(methodology_plan)
+        plan.update(dict.fromkeys(methodology_plan))
+    paths = list(plan)
+
+    existing = None
+    if check_existing and path and os.path.isdir(path):
+        existing = len(snapshot_existing_folders(path, paths))
+    return {
+        "path": path,
+        "languages": languages,
+        "planned": len(paths),
+        "per_methodology": per_methodology,
+        "existing": existing,
+        "missing": len(paths) - (existing or 0),
+        "code_collisions": language_code_collisions(languages, methodologies),
+        "paths": paths,
+    }
+
+# --- Batch Provisioning ---
+BATCH_PROJECT_WORKERS = 4 # Projects provisioned at the same time
+MANIFEST_FIELDS = ("path", "languages", "methodologies")
+
+def _manifest_list(value):
+    """Accepts either a comma separated string or a list from a manifest field."""
+    if isinstance(value, str):
+        return parse_languages(value)
+    if isinstance(value, (list, tuple)):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return []
+
+def load_manifest(manifest_path):
+    """Reads a CSV, JSON or YAML manifest of (path, languages, methodologies) rows.
+
+    CSV needs a header row with those three columns; JSON and YAML hold a list of objects, or an
+    object with a "projects" list. Languages and methodologies may be lists or comma separated
+    strings. Raises ValueError naming the first invalid row, or two rows with the same path.
+    """
+    extension = os.path.splitext(manifest_path)[1].lower()
+    with open(manifest_path, newline='', encoding='utf-8') as f:
+        if extension == ".csv":
+            rows = list(csv.DictReader(f))
+        elif extension == ".json":
+            rows = json.load(f)
+        elif extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML manifests need the PyYAML package (pip install pyyaml).") from None
+            rows = yaml.safe_load(f)
+        else:
+            raise ValueError(f"Unsupported manifest type: {extension or manifest_path} (use .csv, .json or .yaml)")
+
+    if isinstance(rows, dict):
+        rows = rows.get("projects")
+    if not isinstance(rows, list):
+        raise ValueError("The manifest must contain a list of projects.")
+
+    projects, rows_by_path = [], {}
+    for row_number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            raise ValueError(f"Manifest row {row_number}: expected path, languages and methodologies.")
+        project = {
+            "path": str(row.get("path") or "").strip(),
+            "languages": _manifest_list(row.get("languages")),
+            "methodologies": _manifest_list(row.get("methodologies")),
+        }
+        for field in MANIFEST_FIELDS:
+            if not project[field]:
+                raise ValueError(f"Manifest row {row_number}: '{field}' is missing or empty.")
+        try:
+            for methodology in project["methodologies"]:
+                compile_layout(methodology)
+        except ValueError as e:
+            raise ValueError(f"Manifest row {row_number}: {e}") from None
+        # Two runs on one path would share its creation checkpoint
+        first_row = rows_by_path.setdefault(os.path.normcase(os.path.abspath(project["path"])), row_number)
+        if first_row != row_number:
+            raise ValueError(f"Manifest row {row_number}: '{project['path']}' is already row {first_row}; "
+                             f"list each project once.")
+        projects.append(project)
+    return projects
+
+def _provision_project(project, max_workers, skip_existing):
+    """Creates one manifest project and returns its result; errors are reported, not raised."""
+    started = time.perf_counter()
+    try:
+        result = create_folder_structure(project["path"], project["languages"], project["methodologies"],
+                                         max_workers=max_workers, skip_existing=skip_existing)
+        result["status"] = "ok"
+    except Exception as e:
+        result = {"path": project["path"], "status": "error", "error": str(e)}
+    result["elapsed"] = round(time.perf_counter() - started, 3)
+    return result
+
+def provision_projects(projects, project_workers=BATCH_PROJECT_WORKERS, max_workers=FOLDER_CREATION_WORKERS,
+                       skip_existing=True, status_callback=None):
+    """Provisions many projects concurrently with a thread pool across projects.
+
+    status_callback(index, result) is called from the calling thread as each project finishes.
+    Returns a summary with per-project results (in manifest order) and overall throughput.
+    """
+    started = time.perf_counter()
+    results = [None] * len(projects)
+    with ThreadPoolExecutor(max_workers=max(1, project_workers), thread_name_prefix="batch-provisioning") as executor:
+        futures = {
+            executor.submit(_provision_project, project, max_workers, skip_existing): index
+            for index, project in enumerate(projects)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            if status_callback is not None:
+                status_callback(index, results[index])
+
+    elapsed = time.perf_counter() - started
+    folders_created = sum(result.get("created", 0) for result in results)
+    failed = sum(1 for result in results if result["status"] != "ok")
+    return {
+        "projects": len(projects),
+        "succeeded": len(projects) - failed,
+        "failed": failed,
+        "folders_created": folders_created,
+        "elapsed": round(elapsed, 3),
+        "projects_per_second": round(len(projects) / elapsed, 2) if elapsed > 0 else 0.0,
+        "folders_per_second": round(folders_created / elapsed, 1) if elapsed > 0 else 0.0,
+        "results": results,
+    }
+
+# --- Script 2: Empty Folder Deletion Functions ---
+OBSOLETE_DIR_NAME = "_Obsolete"
+SCAN_PROGRESS_INTERVAL = 256 # Folders listed between scan progress reports
+SCAN_WORKERS = 8 # Concurrent folder listings during the empty folder scan; 1 scans serially
+SCAN_QUEUE_FACTOR = 2 # Listings queued per scan worker
+SCAN_CACHE_NAME = "scan_cache.sqlite" # Kept inside _Obsolete, which the scan never enters
+SCAN_CACHE_MTIME_SLACK = 2.0 # Seconds; folders changed this recently are not cached (FAT mtimes are 2 s)
+DRY_RUN_LISTED_ROOTS = 10 # Largest empty roots named in the dry run message
+
+def _report_progress(progress_callback, stage, done, total, started):
+    """Calls progress_callback(stage, done, total, items_per_second) if one was given."""
+    if progress_callback is not None:
+        elapsed = time.perf_counter() - started
+        progress_callback(stage, done, total, done / elapsed if elapsed > 0 else 0.0)
+
+def _list_directory(dirpath):
+    """Lists a directory once; files, symlinks and '_Obsolete' count as content. Raises OSError."""
+    subdirs = []
+    has_content = False
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            if is_dir and OBSOLETE_DIR_NAME not in entry.name:
+                subdirs.append(entry.path)
+            else:
+                has_content = True
+    return subdirs, has_content
+
+def _scan_directory(dirpath, filesystem=LOCAL_FILESYSTEM):
+    """Like _list_directory, but an unreadable folder counts as content."""
+    try:
+        return filesystem.list_directory(dirpath)
+    except OSError:
+        return [], True
+
+class ScanCache:
+    """Remembers each folder's mtime and listing between cleanups, in SQLite under '_Obsolete'.
+
+    scan(dirpath) stats the folder and, if its mtime matches the cached one, returns the cached
+    (subdirs, has_content) instead of listing it again. A folder's mtime only changes when its own
+    entries change, so every folder is still visited; what is skipped is re-reading unchanged
+    listings, which dominates on folders holding many files. Folders modified within
+    SCAN_CACHE_MTIME_SLACK seconds of the scan are not cached, as a later change could keep the
+    same mtime. Files copied in with their timestamps kept do not change it either, so a cached
+    "empty" verdict is only a hint: cleanups list the empty roots again before moving them.
+    With force_rescan the stored entries are ignored and rewritten by save().
+    """
+
+    def __init__(self, root, cache_path=None, force_rescan=False):
+        self.root = root
+        self.cache_path = cache_path or os.path.join(root, OBSOLETE_DIR_NAME, SCAN_CACHE_NAME)
+        self.hits = 0
+        self.misses = 0
+        self._prefix_len = len(os.path.join(root, ""))
+        self._cutoff_ns = time.time_ns() - int(SCAN_CACHE_MTIME_SLACK * 1e9)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._seen = {}
+        if not force_rescan:
+            self._load()
+
+    def _key(self, dirpath):
+        return "" if dirpath == self.root else dirpath[self._prefix_len:]
+
+    def _load(self):
+        if not os.path.isfile(self.cache_path):
+            return
+        try:
+            connection = sqlite3.connect(self.cache_path)
+            try:
+                rows = connection.execute("SELECT path, mtime_ns, has_content, subdirs FROM folders").fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return # Unreadable or outdated cache: scan everything and replace it on save()
+        self._entries = {path: (mtime_ns, bool(has_content), json.loads(subdirs))
+                         for path, mtime_ns, has_content, subdirs in rows}
+
+    def scan(self, dirpath):
+        """Drop-in for _scan_directory; safe to call from several scan threads."""
+        try:
+            mtime_ns = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            return [], True
+        key = self._key(dirpath)
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            entry = cached
+            with self._lock:
+                self.hits += 1
+        else:
+            try:
+                subdirs, has_content = _list_directory(dirpath)
+            except OSError:
+                return [], True
+            entry = (mtime_ns, has_content, [os.path.basename(subdir) for subdir in subdirs])
+            with self._lock:
+                self.misses += 1
+        if entry[0] < self._cutoff_ns:
+            with self._lock:
+                self._seen[key] = entry
+        return [os.path.join(dirpath, name) for name in entry[2]], entry[1]
+
+    def save(self):
+        """Replaces the cache file with the folders visited by this scan; returns its path."""
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        temp_path = self.cache_path + ".tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        connection = sqlite3.connect(temp_path)
+        try:
+            with connection:
+                connection.execute("CREATE TABLE folders (path TEXT PRIMARY KEY, mtime_ns INTEGER, "
+                                   "has_content INTEGER, subdirs TEXT)")
+                connection.executemany("INSERT INTO folders VALUES (?, ?, ?, ?)",
+                                       ((path, mtime_ns, int(has_content), json.dumps(names))
+                                        for path, (mtime_ns, has_content, names) in self._seen.items()))
+        finally:
+            connection.close()
+        os.replace(temp_path, self.cache_path)
+        return self.cache_path
+
+def _walk_sequential(path, list_directory, add_roots, progress_callback, should_stop, started):
+    """Single-threaded post-order walk; returns the number of folders listed."""
+    scanned = 1
+    subdirs, has_content = list_directory(path)
+    # Each frame is [dirpath, pending subdirs, collapsible, (child, folder count) pairs awaiting
+    # the parent's verdict, folders in the subtree while it is still collapsible]
+    stack = [[path, subdirs, not has_content, [], 1]]
+    while stack:
+        frame = stack[-1]
+        if frame[1]:
+            if should_stop is not None and should_stop():
+                break
+            child = frame[1].pop()
+            child_subdirs, child_has_content = list_directory(child)
+            scanned += 1
+            if scanned % SCAN_PROGRESS_INTERVAL == 0:
+                _report_progress(progress_callback, "scan", scanned, 0, started)
+            stack.append([child, child_subdirs, not child_has_content, [], 1])
+            continue
+
+        stack.pop()
+        dirpath, _, collapsible, collapsible_children, folder_count = frame
+        if not stack:
+            add_roots(collapsible_children)
+            break
+
+        parent = stack[-1]
+        if collapsible:
+            if parent[2]:
+                parent[3].append((dirpath, folder_count))
+                parent[4] += folder_count
+            else:
+                add_roots([(dirpath, folder_count)])
+        elif parent[2]:
+            parent[2] = False
+            add_roots(parent[3])
+            parent[3] = []
+    return scanned
+
+class _ScanNode:
+    """A listed folder of the parallel walk, waiting for its subfolders' verdicts."""
+    __slots__ = ("path", "parent", "pending", "collapsible", "collapsible_children", "folder_count")
+
+    def __init__(self, path, parent):
+        self.path = path
+        self.parent = parent
+        self.pending = 0
+        self.collapsible = False
+        self.collapsible_children = []
+        self.folder_count = 1
+
+def _finish_node(node, add_roots):
+    """Combines a fully resolved node into its parent, walking up while parents resolve too."""
+    while True:
+        parent = node.parent
+        if parent is None:
+            add_roots(node.collapsible_children)
+            return
+        if node.collapsible:
+            if parent.collapsible:
+                parent.collapsible_children.append((node.path, node.folder_count))
+                parent.folder_count += node.folder_count
+            else:
+                add_roots([(node.path, node.folder_count)])
+        elif parent.collapsible:
+            parent.collapsible = False
+            add_roots(parent.collapsible_children)
+            parent.collapsible_children = []
+        parent.pending -= 1
+        if parent.pending:
+            return
+        node = parent
+
+def _walk_parallel(path, list_directory, add_roots, progress_callback, should_stop, max_workers, started):
+    """Lists folders on a thread pool and combines the verdicts bottom-up; returns the folders listed.
+
+    At most SCAN_QUEUE_FACTOR * max_workers listings are queued at once; folders not yet submitted
+    wait in a depth-first frontier. Node state is only touched by the calling thread.
+    """
+    scanned = 0
+    frontier = [_ScanNode(path, None)]
+    in_flight = {}
+    queue_limit = max_workers * SCAN_QUEUE_FACTOR
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while frontier or in_flight:
+            if should_stop is not None and should_stop():
+                for future in in_flight:
+                    future.cancel()
+                break
+            while frontier and len(in_flight) < queue_limit:
+                node = frontier.pop()
+                in_flight[executor.submit(list_directory, node.path)] = node
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = in_flight.pop(future)
+                subdirs, has_content = future.result()
+                scanned += 1
+                if scanned % SCAN_PROGRESS_INTERVAL == 0:
+                    _report_progress(progress_callback, "scan", scanned, 0, started)
+                node.collapsible = not has_content
+                node.pending = len(subdirs)
+                if subdirs:
+                    frontier.extend(_ScanNode(child, node) for child in subdirs)
+                else:
+                    _finish_node(node, add_roots)
+    return scanned
+
+def _walk_async(path, list_directory, add_roots, progress_callback, should_stop, async_filesystem, started):
+    """_walk_parallel on an AsyncFileSystem: its concurrency limit bounds the listings in flight."""
+    scanned = 0
+
+    def list_node(node):
+        return list_directory(node.path)
+
+    def add_listing(node, listing):
+        nonlocal scanned
+        subdirs, has_content = listing
+        scanned += 1
+        if scanned % SCAN_PROGRESS_INTERVAL == 0:
+            _report_progress(progress_callback, "scan", scanned, 0, started)
+        node.collapsible = not has_content
+        node.pending = len(subdirs)
+        if subdirs:
+            frontier.extend(_ScanNode(child, node) for child in subdirs)
+        else:
+            _finish_node(node, add_roots)
+
+    frontier = [_ScanNode(path, None)]
+    async_filesystem.execute(_run_bounded(async_filesystem, list_node, frontier, add_listing, should_stop))
+    return scanned
+
+def identify_empty_dirs(path, progress_callback=None, should_stop=None, folder_counts=None, max_workers=SCAN_WORKERS,
+                        scan_cache=None, metrics=None, filesystem=None):
+    """Returns the topmost folders under path that are empty or hold only empty folders.
+
+    Post-order os.scandir pass listing each folder once; the scanned root itself is never returned.
+    With max_workers > 1 the listings run on a thread pool, which hides per-call latency on
+    network shares; max_workers=1 walks serially. The roots are the same either way, only their
+    order may differ. If should_stop() turns true the scan ends early with the roots confirmed
+    so far. If a folder_counts dict is given it receives, per returned root, the number of
+    folders in its subtree (the root included). A ScanCache reuses the listings of folders
+    unchanged since it was saved; saving it again is left to the caller. A RunMetrics times
+    every folder listing. filesystem selects the backend (the scan cache reads the local disk);
+    with an AsyncFileSystem its concurrency limit replaces max_workers.
+    """
+    started = time.perf_counter()
+    empty_roots = []
+    backend, async_filesystem = _backends(filesystem)
+    if scan_cache is not None:
+        list_directory = scan_cache.scan
+    elif backend is LOCAL_FILESYSTEM:
+        list_directory = _scan_directory
+    else:
+        def list_directory(dirpath):
+            return _scan_directory(dirpath, backend)
+    if metrics is not None:
+        list_directory = metrics.timed("scandir", list_directory)
+
+    def add_roots(roots):
+        for root, folder_count in roots:
+            empty_roots.append(root)
+            if folder_counts is not None:
+                folder_counts[root] = folder_count
+
+    if async_filesystem is not None:
+        scanned = _walk_async(path, list_directory, add_roots, progress_callback, should_stop, async_filesystem, started)
+    elif max_workers > 1:
+        scanned = _walk_parallel(path, list_directory, add_roots, progress_callback, should_stop, max_workers, started)
+    else:
+        scanned = _walk_sequential(path, list_directory, add_roots, progress_callback, should_stop, started)
+    _report_progress(progress_callback, "scan", scanned, 0, started)
+    return empty_roots
+
+def _subtree_is_empty(folder, filesystem=LOCAL_FILESYSTEM):
+    """Lists folder's subtree again, stopping at the first content; True if none was found."""
+    stack = [folder]
+    while stack:
+        subdirs, has_content = _scan_directory(stack.pop(), filesystem)
+        if has_content:
+            return False
+        stack.extend(subdirs)
+    return True
+
+def _recheck_empty_roots(empty_roots, filesystem=None):
+    """Confirms empty roots taken from an index that may lag the disk, before they are moved.
+
+    A root whose subtree is still empty is kept; one that received content since is scanned
+    again and replaced by its own empty roots, if any; a root that is gone is dropped.
+    """
+    backend = _backends(filesystem)[0]
+    confirmed = []
+    for root in empty_roots:
+        if _subtree_is_empty(root, backend):
+            confirmed.append(root)
+        else:
+            confirmed.extend(identify_empty_dirs(root, max_workers=1, filesystem=backend))
+    return confirmed
+
+def _move_folder(folder, dest_folder):
+    """Moves folder to dest_folder with one os.rename, copying then deleting only across devices.
+
+    dest_folder must not exist yet: a taken name fails instead of moving the folder inside it.
+    """
+    try:
+        os.rename(folder, dest_folder)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(folder, dest_folder)
+
+def move_empty_dirs(empty_folders, obsolete_dir, progress_callback=None, should_stop=None, report_writer=None,
+                    journal=None, metrics=None, filesystem=None):
+    """Moves each empty root into obsolete_dir, keeping its path relative to the cleaned folder.
+
+    Expects the collapsed roots from identify_empty_dirs, so each subtree is one rename.
+    Destination parents are listed (or created) once per unique parent; a name an earlier
+    cleanup already used there gets a numeric suffix (a_2, a_3, ...). So does the first ancestor
+    that an earlier cleanup's journal lists as a destination, so a root never lands inside a
+    folder moved before. The report and journal record the real destination. Each outcome is
+    streamed to report_writer as it happens and every completed move is recorded in journal (a
+    MoveJournal). Progress goes through a ProgressChannel, so progress_callback is rate limited.
+    Stops between moves once should_stop() is true. A RunMetrics times every rename and
+    parent creation. filesystem selects the backend; with an AsyncFileSystem the moves overlap,
+    up to its concurrency limit, and finish in any order. Returns (moved, failed) counts.
+    """
+    started = time.perf_counter()
+    backend, async_filesystem = _backends(filesystem)
+    base = os.path.dirname(obsolete_dir)
+    base_prefix = os.path.join(base, "")
+    parent_names = {} # Destination parent -> normcased names taken in it
+    earlier_destinations = _journaled_destinations(base)
+    redirected = {} # Earlier destination on the way to a new one -> the free folder used instead
+    names_lock = threading.RLock()
+    move_folder = backend.move if metrics is None else metrics.timed("rename", backend.move)
+    make_parent = backend.makedirs if metrics is None else metrics.timed("makedirs", backend.makedirs)
+    list_names = (backend.subdirectory_names if metrics is None
+                  else metrics.timed("scandir", backend.subdirectory_names))
+    moved = failed = 0
+    progress = None
+    if progress_callback is not None:
+        # One update per rename would flood the GUI's event queue
+        progress = ProgressChannel(lambda stage, done, total, eta:
+                                   _report_progress(progress_callback, stage, done, total, started))
+        progress.start_stage("move", len(empty_folders))
+
+    def free_name(dest_parent, name):
+        """Returns dest_parent/name, or the first name_<n> there not taken by an earlier cleanup or this run."""
+        taken = parent_names.get(dest_parent)
+        if taken is None:
+            try:
+                names = {os.path.normcase(existing) for existing in list_names(dest_parent)}
+            except FileNotFoundError:
+                # Concurrent moves may both create a new parent; makedirs tolerates that
+                make_parent(dest_parent)
+                names = set()
+            with names_lock:
+                taken = parent_names.setdefault(dest_parent, names)
+        with names_lock:
+            candidate, suffix = name, 1
+            while os.path.normcase(candidate) in taken:
+                suffix += 1
+                candidate = f"{name}_{suffix}"
+            taken.add(os.path.normcase(candidate))
+        return os.path.join(dest_parent, candidate)
+
+    def free_destination(relative_path):
+        """Maps a root's path relative to the cleaned folder to a free destination in obsolete_dir."""
+        *folders, name = relative_path.split(os.sep)
+        dest_parent = obsolete_dir
+        for folder in folders:
+            dest_parent = os.path.join(dest_parent, folder)
+            if os.path.normcase(dest_parent) in earlier_destinations:
+                with names_lock:
+                    if dest_parent not in redirected:
+                        redirected[dest_parent] = free_name(os.path.dirname(dest_parent), folder)
+                    dest_parent = redirected[dest_parent]
+        return free_name(dest_parent, name)
+
+    def move_one(folder):
+        """Moves one root; returns (dest_folder, error, seconds, identity) instead of raising."""
+        move_started = time.perf_counter()
+        dest_folder = identity = None
+        try:
+            if folder.startswith(base_prefix):
+                relative_path = folder[len(base_prefix):]
+            else:
+                relative_path = os.path.relpath(folder, base)
+            dest_folder = free_destination(relative_path)
+            move_folder(folder, dest_folder)
+        except Exception as e:
+            return dest_folder, e, time.perf_counter() - move_started, None
+        seconds = time.perf_counter() - move_started
+        if journal is not None:
+            try:
+                identity = backend.identity(dest_folder)
+            except OSError:
+                pass # Restore then trusts the name alone
+        return dest_folder, None, seconds, identity
+
+    def record(folder, outcome):
+        nonlocal moved, failed
+        dest_folder, error, seconds, identity = outcome
+        if error is None:
+            moved += 1
+            if journal is not None:
+                journal.record(folder, dest_folder, identity)
+            if report_writer is not None:
+                report_writer.write(f"Moved: {folder} to {dest_folder}", folder, "move", "moved", seconds)
+        else:
+            failed += 1
+            if report_writer is not None:
+                report_writer.write(f"Failed to move {folder}: {error}", folder, "move", "failed", seconds,
+                                    error=str(error))
+        if progress is not None:
+            progress.advance()
+
+    if async_filesystem is not None:
+        async_filesystem.execute(_run_bounded(async_filesystem, move_one, list(reversed(empty_folders)), record,
+                                              should_stop))
+    else:
+        for folder in empty_folders:
+            if should_stop is not None and should_stop():
+                break
+            record(folder, move_one(folder))
+    if progress is not None:
+        progress.finish()
+    return moved, failed
+
+# --- Live Emptiness Index (watch mode) ---
+WATCH_MAX_FOLDERS = 500_000 # Folders a watched index may hold; beyond that cleanups scan again
+WATCH_POLL_INTERVAL = 5.0 # Seconds between mtime sweeps when watchdog is not installed
+WATCH_EVENT_DELAY = 0.2 # Seconds watchdog events are collected before the index is updated
+WATCH_EVENT_TYPES = ("created", "deleted", "moved") # Events that can change a folder's listing
+
+def _count_directory(dirpath):
+    """Returns (subfolder names, content entries) of one listing, counted like _list_directory. Raises OSError."""
+    names = []
+    content = 0
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            if is_dir and OBSOLETE_DIR_NAME not in entry.name:
+                names.append(entry.name)
+            else:
+                content += 1
+    return names, content
+
+class EmptinessIndex:
+    """Content counts of every folder under root, stored compactly enough to stay in memory.
+
+    Each folder is one "<parent id>/<name>" key plus a slot in six flat arrays (parent, first
+    child, next sibling, own and subtree content counts, mtime). Content is counted as in
+    identify_empty_dirs, so a folder is empty when its subtree count is 0. refresh() re-lists one
+    folder and reconciles its subfolders; poll() does that for every folder whose mtime changed.
+    Past max_folders no folders are added and overflowed is set, telling callers to scan instead.
+    All public methods are thread safe.
+    """
+
+    def __init__(self, root, max_folders=WATCH_MAX_FOLDERS):
+        self.root = root
+        self.max_folders = max_folders
+        self.overflowed = False
+        self._root_prefix = os.path.join(root, "")
+        self._lock = threading.RLock()
+        self._ids = {}
+        self._keys = []
+        self._free = []
+        self._parent = array('q')
+        self._first_child = array('q')
+        self._next_sibling = array('q')
+        self._content = array('q')
+        self._subtree = array('q')
+        self._mtime = array('q')
+        self._new_node(-1, "")
+
+    def __len__(self):
+        return len(self._keys) - len(self._free)
+
+    def _new_node(self, parent, name):
+        key = f"{parent}/{name}" if parent >= 0 else ""
+        if self._free:
+            node = self._free.pop()
+            self._keys[node] = key
+            self._parent[node] = parent
+            self._first_child[node] = self._next_sibling[node] = -1
+            self._content[node] = self._subtree[node] = self._mtime[node] = 0
+        else:
+            node = len(self._keys)
+            self._keys.append(key)
+            self._parent.append(parent)
+            self._first_child.append(-1)
+            self._next_sibling.append(-1)
+            self._content.append(0)
+            self._subtree.append(0)
+            self._mtime.append(0)
+        if parent >= 0:
+            self._ids[key] = node
+            self._next_sibling[node] = self._first_child[parent]
+            self._first_child[parent] = node
+        return node
+
+    def _name(self, node):
+        return self._keys[node].split("/", 1)[1]
+
+    def _children(self, node):
+        child = self._first_child[node]
+        while child >= 0:
+            yield child
+            child = self._next_sibling[child]
+
+    def _node(self, dirpath):
+        """Returns the id of an indexed folder, or None."""
+        if dirpath == self.root or dirpath == self._root_prefix:
+            return 0
+        node = 0
+        for name in _relative_to(dirpath, self._root_prefix).split(os.sep):
+            node = self._ids.get(f"{node}/{name}")
+            if node is None:
+                return None
+        return node
+
+    def _add_content(self, node, delta):
+        if not delta:
+            return
+        while node >= 0:
+            self._subtree[node] += delta
+            node = self._parent[node]
+
+    def _free_subtree(self, node):
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            stack.extend(self._children(current))
+            del self._ids[self._keys[current]]
+            self._keys[current] = None
+            self._free.append(current)
+
+    def _reconcile(self, node, dirpath):
+        """Re-lists one folder; returns the (node, path) pairs of subfolders that are new to the index."""
+        try:
+            mtime_ns = os.stat(dirpath).st_mtime_ns
+            names, content = _count_directory(dirpath)
+        except FileNotFoundError:
+            return [] # Already gone; reconciling its parent drops it
+        except OSError:
+            names, content, mtime_ns = [], 1, 0 # Unreadable folders count as content
+        # A change later in the same mtime tick would go unnoticed, so recent folders get rechecked
+        recent_cutoff = time.time_ns() - int(SCAN_CACHE_MTIME_SLACK * 1e9)
+        self._mtime[node] = mtime_ns if mtime_ns < recent_cutoff else 0
+        self._add_content(node, content - self._content[node])
+        self._content[node] = content
+
+        wanted = set(names)
+        kept = []
+        for child in list(self._children(node)):
+            name = self._name(child)
+            if name in wanted:
+                wanted.discard(name)
+                kept.append(child)
+            else:
+                self._add_content(node, -self._subtree[child])
+                self._free_subtree(child)
+        self._first_child[node] = -1
+        for child in kept:
+            self._next_sibling[child] = self._first_child[node]
+            self._first_child[node] = child
+
+        added = []
+        for name in wanted:
+            if len(self) >= self.max_folders:
+                self.overflowed = True
+                break
+            added.append((self._new_node(node, name), os.path.join(dirpath, name)))
+        return added
+
+    def _sync_tree(self, node, dirpath):
+        stack = [(node, dirpath)]
+        while stack:
+            stack.extend(self._reconcile(*stack.pop()))
+
+    def build(self):
+        """Indexes the whole tree with one scan; returns the number of folders indexed."""
+        with self._lock:
+            self._sync_tree(0, self.root)
+            return len(self)
+
+    def refresh(self, dirpath):
+        """Re-lists an indexed folder, scanning new subfolders and dropping vanished ones.
+
+        Returns False if dirpath is not indexed; refreshing its parent picks it up.
+        """
+        with self._lock:
+            node = self._node(dirpath)
+            if node is None:
+                return False
+            self._sync_tree(node, dirpath)
+            return True
+
+    def poll(self):
+        """Refreshes every folder whose mtime changed since it was indexed; returns how many."""
+        with self._lock:
+            changed = []
+            stack = [(0, self.root)]
+            while stack:
+                node, dirpath = stack.pop()
+                try:
+                    if os.stat(dirpath).st_mtime_ns != self._mtime[node]:
+                        changed.append((node, dirpath))
+                except OSError:
+                    continue
+                stack.extend((child, os.path.join(dirpath, self._name(child))) for child in self._children(node))
+            for node, dirpath in changed:
+                if self._node(dirpath) == node: # Not dropped or reused by an earlier refresh in this sweep
+                    self._sync_tree(node, dirpath)
+            return len(changed)
+
+    def empty_roots(self, folder_counts=None):
+        """Returns the topmost empty folders, exactly as identify_empty_dirs would, without listing anything.
+
+        If a folder_counts dict is given it receives, per root, the number of folders in its subtree.
+        """
+        with self._lock:
+            roots = []
+            stack = [(0, self.root)]
+            while stack:
+                node, dirpath = stack.pop()
+                for child in self._children(node):
+                    child_path = os.path.join(dirpath, self._name(child))
+                    if self._subtree[child]:
+                        stack.append((child, child_path))
+                        continue
+                    roots.append(child_path)
+                    if folder_counts is not None:
+                        subtree = [child]
+                        folder_count = 0
+                        while subtree:
+                            folder_count += 1
+                            subtree.extend(self._children(subtree.pop()))
+                        folder_counts[child_path] = folder_count
+            return roots
+
+    def empty_folders(self, names=None):
+        """Returns every empty folder (not only the topmost), optionally only those named in names."""
+        with self._lock:
+            folders = []
+            stack = [(0, self.root)]
+            while stack:
+                node, dirpath = stack.pop()
+                for child in self._children(node):
+                    name = self._name(child)
+                    child_path = os.path.join(dirpath, name)
+                    if not self._subtree[child] and (names is None or name in names):
+                        folders.append(child_path)
+                    stack.append((child, child_path))
+            return folders
+
+    def stats(self):
+        """Returns folder and empty folder counts and the approximate memory held by the index."""
+        with self._lock:
+            arrays = (self._parent, self._first_child, self._next_sibling, self._content, self._subtree, self._mtime)
+            memory = (sys.getsizeof(self._ids) + sys.getsizeof(self._keys) + sys.getsizeof(self._free)
+                      + sum(sys.getsizeof(key) for key in self._keys if key is not None)
+                      + sum(values.itemsize * len(values) for values in arrays))
+            return {
+                "path": self.root,
+                "folders": len(self),
+                "empty_folders": sum(1 for node, key in enumerate(self._keys) if node and key is not None
+                                     and not self._subtree[node]),
+                "overflowed": self.overflowed,
+                "memory_bytes": memory,
+            }
+
+class FolderWatcher:
+    """Keeps an EmptinessIndex of root current from a background thread.
+
+    With the optional watchdog package (inotify, ReadDirectoryChangesW, FSEvents) the folders
+    touched by events are collected for WATCH_EVENT_DELAY and then re-listed; without it every
+    folder's mtime is polled each poll_interval seconds. start() blocks for the initial scan.
+    """
+
+    def __init__(self, root, poll_interval=WATCH_POLL_INTERVAL, use_watchdog=True, max_folders=WATCH_MAX_FOLDERS):
+        if not root or not os.path.isdir(root):
+            raise ValueError("Please enter a valid path to watch.")
+        self.index = EmptinessIndex(root, max_folders)
+        self.poll_interval = poll_interval
+        self.use_watchdog = use_watchdog
+        self.backend = None
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._observer = None
+        self._thread = None
+
+    def start(self):
+        # Events arriving during the initial scan are queued and applied right after it
+        self._observer = self._start_observer() if self.use_watchdog else None
+        self.backend = "watchdog" if self._observer is not None else "polling"
+        self.index.build()
+        if self.index.overflowed:
+            self.stop()
+            raise ValueError(f"{self.index.root} holds more than {self.index.max_folders:,} folders, "
+                             "the limit for watch mode.")
+        self._thread = threading.Thread(target=self._run, name="FolderWatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def _start_observer(self):
+        try:
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+        observer = Observer()
+        observer.schedule(self, self.index.root, recursive=True)
+        observer.start()
+        return observer
+
+    def dispatch(self, event):
+        """watchdog event handler: marks the folders whose listings the event changed."""
+        if event.event_type not in WATCH_EVENT_TYPES:
+            return
+        dirty = [os.path.dirname(os.fsdecode(event.src_path))]
+        if event.event_type == "moved":
+            dirty.append(os.path.dirname(os.fsdecode(event.dest_path)))
+        with self._dirty_lock:
+            self._dirty.update(dirty)
+
+    def _run(self):
+        interval = WATCH_EVENT_DELAY if self._observer is not None else self.poll_interval
+        while not self._stop_event.wait(interval):
+            if self._observer is None:
+                self.index.poll()
+                continue
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+            for dirpath in sorted(dirty, key=len): # Parents first, so new subtrees are scanned once
+                self.index.refresh(dirpath)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._thread is not None:
+            self._thread.join()
+
+# --- Project Inventory ---
+INVENTORY_NAME = ".james_inventory.sqlite" # Kept in the project folder
+INVENTORY_TARGET_DIR = os.path.join("Work", "06_Target") # Indexed as <language>/<methodology>/<stage>/...
+INVENTORY_VERSION = 1
+
+class ProjectInventory:
+    """Stage x language index of a project's Work/06_Target tree, persisted in SQLite.
+
+    Every stage folder below <language>/<methodology> gets a row with the number of files in its
+    subtree, their total bytes and the latest file mtime, so status questions ("which languages
+    still have an empty 03_BT/02_fromLing?") are answered from memory by query(). refresh() lists
+    folders on a thread pool and, like ScanCache, only relists folders whose mtime changed; every
+    folder is still stat'ed. Files rewritten in place keep their folder's mtime, so their new size
+    shows after a refresh of that subtree or a rebuild. Folders changed within
+    SCAN_CACHE_MTIME_SLACK seconds are always relisted next time. Med_Devices buckets sit outside
+    06_Target and are not indexed.
+    """
+
+    def __init__(self, project_path, index_path=None):
+        self.project_path = project_path
+        self.target_path = os.path.join(project_path, INVENTORY_TARGET_DIR)
+        self.index_path = index_path or os.path.join(project_path, INVENTORY_NAME)
+        self.updated = None
+        self._folders = {} # Folder key relative to target_path -> (mtime_ns, files, bytes, latest, subdir names)
+        self._rows = {}
+        self._load()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _key(self, path):
+        """Folder key for a path relative to target_path, or an absolute path inside it."""
+        if os.path.isabs(path):
+            path = os.path.relpath(path, self.target_path)
+        path = os.path.normpath(path)
+        return "" if path == os.curdir else path
+
+    def _load(self):
+        if not os.path.isfile(self.index_path):
+            return
+        try:
+            connection = sqlite3.connect(self.index_path)
+            try:
+                meta = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+                rows = connection.execute("SELECT path, mtime_ns, files, bytes, latest, subdirs FROM folders").fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return # Unreadable index: the next refresh rebuilds it
+        if meta.get("version") != str(INVENTORY_VERSION):
+            return
+        self.updated = meta.get("updated")
+        self._folders = {path: (mtime_ns, files, size, latest, tuple(json.loads(subdirs)))
+                         for path, mtime_ns, files, size, latest, subdirs in rows}
+        self._aggregate()
+
+    def save(self):
+        """Replaces the index file with the current folders; returns its path."""
+        temp_path = self.index_path + ".tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        connection = sqlite3.connect(temp_path)
+        try:
+            with connection:
+                connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+                connection.executemany("INSERT INTO meta VALUES (?, ?)",
+                                       [("version", str(INVENTORY_VERSION)), ("updated", self.updated or "")])
+                connection.execute("CREATE TABLE folders (path TEXT PRIMARY KEY, mtime_ns INTEGER, files INTEGER, "
+                                   "bytes INTEGER, latest REAL, subdirs TEXT)")
+                connection.executemany("INSERT INTO folders VALUES (?, ?, ?, ?, ?, ?)",
+                                       ((path, mtime_ns, files, size, latest, json.dumps(subdirs))
+                                        for path, (mtime_ns, files, size, latest, subdirs) in self._folders.items()))
+        finally:
+            connection.close()
+        os.replace(temp_path, self.index_path)
+        return self.index_path
+
+    def _visit(self, key, cached, cutoff_ns):
+        """Returns (record, reused) for one folder, or (None, False) if it is gone or unreadable."""
+        dirpath = os.path.join(self.target_path, key)
+        try:
+            mtime_ns = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            return None, False
+        if cached is not None and cached[0] == mtime_ns:
+            return cached, True
+        files = size = 0
+        latest = 0.0
+        subdirs = []
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    files += 1
+                    size += stat.st_size
+                    latest = max(latest, stat.st_mtime)
+        except OSError:
+            return None, False
+        # A folder changed just now could change again within the same mtime tick: never match it
+        return (mtime_ns if mtime_ns < cutoff_ns else -1, files, size, latest, tuple(subdirs)), False
+
+    def refresh(self, subpaths=None, progress_callback=None, should_stop=None, max_workers=SCAN_WORKERS):
+        """Brings the index up to date and returns counts of the folders listed and reused.
+
+        subpaths (relative to Work/06_Target, or absolute) limits the walk to those subtrees; the
+        rest of the index is kept as is. progress_callback(stage, done, 0, folders/s) reports the
+        walk. If should_stop() turns true the index keeps its previous state. Call save() to persist.
+        Raises ValueError if the project has no Work/06_Target folder.
+        """
+        if not os.path.isdir(self.target_path):
+            raise ValueError(f"No {INVENTORY_TARGET_DIR} folder found in {self.project_path}.")
+        started = time.perf_counter()
+        cutoff_ns = time.time_ns() - int(SCAN_CACHE_MTIME_SLACK * 1e9)
+        starts = [""] if subpaths is None else [self._key(subpath) for subpath in subpaths]
+        folders = {}
+        listed = reused = 0
+        frontier = list(starts)
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix="inventory") as executor:
+            while frontier or in_flight:
+                if should_stop is not None and should_stop():
+                    for future in in_flight:
+                        future.cancel()
+                    return {"folders": len(self._folders), "listed": listed, "reused": reused, "cancelled": True}
+                while frontier and len(in_flight) < max(max_workers, 1) * SCAN_QUEUE_FACTOR:
+                    key = frontier.pop()
+                    in_flight[executor.submit(self._visit, key, self._folders.get(key), cutoff_ns)] = key
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = in_flight.pop(future)
+                    record, was_reused = future.result()
+                    if record is None:
+                        continue
+                    folders[key] = record
+                    reused += was_reused
+                    listed += not was_reused
+                    frontier.extend(os.path.join(key, name) if key else name for name in record[4])
+                    if (listed + reused) % SCAN_PROGRESS_INTERVAL == 0:
+                        _report_progress(progress_callback, "inventory", listed + reused, 0, started)
+
+        if subpaths is None:
+            self._folders = folders
+        else:
+            for start in starts:
+                prefix = os.path.join(start, "")
+                for key in [key for key in self._folders if key == start or not start or key.startswith(prefix)]:
+                    del self._folders[key]
+            self._folders.update(folders)
+        self.updated = datetime.now().isoformat(timespec="seconds")
+        self._aggregate()
+        _report_progress(progress_callback, "inventory", listed + reused, 0, started)
+        return {"folders": len(self._folders), "listed": listed, "reused": reused, "cancelled": False}
+
+    def _aggregate(self):
+        """Rolls the per-folder file counts up into one row per (language, methodology, stage)."""
+        totals = {}
+        for key in sorted(self._folders, key=lambda key: key.count(os.sep) if key else -1, reverse=True):
+            _, files, size, latest, subdirs = self._folders[key]
+            for name in subdirs:
+                child = totals.get(os.path.join(key, name) if key else name)
+                if child is not None:
+                    files, size, latest = files + child[0], size + child[1], max(latest, child[2])
+            totals[key] = (files, size, latest)
+        rows = {}
+        for key, total in totals.items():
+            parts = key.split(os.sep) if key else []
+            if len(parts) >= 3:
+                rows[(parts[0], parts[1], "/".join(parts[2:]))] = total
+        self._rows = dict(sorted(rows.items())) # Sorted once here so queries never sort
+
+    def query(self, stage=None, methodology=None, language=None, empty=None):
+        """Returns the rows matching every given filter, sorted by language, methodology and stage.
+
+        stage, methodology and language are case-insensitive fnmatch patterns; stages use '/'
+        between levels, e.g. "03_BT/02_fromLing" or "*/02_fromLing". empty=True keeps stages
+        without any file, empty=False those with files. Each row is a dict with language,
+        methodology, stage, files, bytes and latest (a timestamp, 0 without files).
+        """
+        patterns = [(index, re.compile(fnmatch.translate(pattern), re.IGNORECASE).match)
+                    for index, pattern in enumerate((language, methodology, stage)) if pattern is not None]
+        rows = []
+        for key, (files, size, latest) in self._rows.items():
+            if empty is not None and (files == 0) != empty:
+                continue
+            if all(match(key[index]) for index, match in patterns):
+                rows.append({"language": key[0], "methodology": key[1], "stage": key[2],
+                             "files": files, "bytes": size, "latest": latest})
+        return rows
+
+    def languages(self):
+        return sorted({language for language, _, _ in self._rows})
+
+    def stages(self):
+        return sorted({stage for _, _, stage in self._rows})
+
+# --- Streaming Reports ---
+REPORT_BUFFER_SIZE = 256 * 1024 # Bytes buffered per report file between writes
+REPORT_FLUSH_INTERVAL = 1.0 # Seconds between forced flushes, so a killed run leaves a usable report
+MOVED_REPORT_NAME = "moved_folders_report" # One entry per moved or failed folder of a cleanup
+REPORT_FETCH_ROWS = 1000 # Matching entries indexed per ReportReader.fetch()
+REPORT_FETCH_BYTES = 4 * 1024 * 1024 # Bytes scanned per fetch at most, so selective filters stay responsive
+REPORT_ROW_CACHE = 1024 # Parsed entries a ReportReader keeps for repeated row() calls
+
+class ReportWriter:
+    """Streams report entries to a buffered text file, plus an optional JSONL twin.
+
+    Each entry is written as it happens and the files are flushed periodically, so memory stays
+    flat however many entries there are. JSONL lines hold path, action, status and duration.
+    With a RunMetrics every write and flush is timed and the final file sizes are counted.
+    """
+
+    def __init__(self, text_path, header, jsonl_path=None, metrics=None):
+        self.text_path = text_path
+        self.jsonl_path = jsonl_path
+        self.count = 0
+        self.metrics = metrics
+        if metrics is not None:
+            self.write = metrics.timed("report_write", self.write)
+            self.flush = metrics.timed("report_flush", self.flush)
+        self._text_file = open(text_path, 'w', buffering=REPORT_BUFFER_SIZE, encoding='utf-8')
+        self._jsonl_file = open(jsonl_path, 'w', buffering=REPORT_BUFFER_SIZE, encoding='utf-8') if jsonl_path else None
+        self._text_file.write(header + "\n")
+        self._last_flush = time.monotonic()
+
+    def write(self, line, path, action, status, duration=None, error=None):
+        self._text_file.write(line + "\n")
+        if self._jsonl_file is not None:
+            entry = {"path": path, "action": action, "status": status,
+                     "duration": round(duration, 6) if duration is not None else None}
+            if error is not None:
+                entry["error"] = error
+            self._jsonl_file.write(json.dumps(entry) + "\n")
+        self.count += 1
+        now = time.monotonic()
+        if now - self._last_flush >= REPORT_FLUSH_INTERVAL:
+            self.flush()
+            self._last_flush = now
+
+    def flush(self):
+        self._text_file.flush()
+        if self._jsonl_file is not None:
+            self._jsonl_file.flush()
+
+    def close(self):
+        self._text_file.close()
+        if self._jsonl_file is not None:
+            self._jsonl_file.close()
+        if self.metrics is not None:
+            self.metrics.add_bytes(sum(os.path.getsize(path) for path in self.paths))
+
+    @property
+    def paths(self):
+        return [self.text_path] + ([self.jsonl_path] if self.jsonl_path else [])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class ReportReader:
+    """Lazily indexed, filtered view of a JSONL report written by ReportWriter.
+
+    fetch() scans the next part of the file and keeps only the byte offsets of matching entries,
+    8 bytes per row, so a report of a million entries is browsed without loading it; row(index)
+    seeks to and parses one entry. status keeps entries with that status (e.g. "failed");
+    methodology and language keep entries whose path contains a folder of that name, ignoring
+    case. A line still being written is left for a later fetch: at_end turns true at the end
+    of the file, and poll() clears it again once the writer has appended more.
+    """
+
+    def __init__(self, jsonl_path, status=None, methodology=None, language=None):
+        self.jsonl_path = jsonl_path
+        self.status = status
+        self.folder_names = [name.lower() for name in (methodology, language) if name]
+        # Byte needles every matching line must contain, checked before parsing it; names that
+        # JSON escapes (non-ASCII) are only checked after parsing
+        self._status_needle = f'"status": {json.dumps(status)}'.encode() if status is not None else None
+        self._name_needles = [name.encode() for name in self.folder_names if name.isascii()]
+        self._filtered = status is not None or bool(self.folder_names)
+        self.at_end = False
+        self._end_size = 0 # File size when at_end was set
+        self._offsets = array('q')
+        self._scanned = 0
+        self._cache = {}
+        self._file = open(jsonl_path, 'rb')
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _matches(self, entry):
+        if self.status is not None and entry.get("status") != self.status:
+            return False
+        if self.folder_names:
+            folders = {folder.lower() for folder in re.split(r"[\\/]", entry.get("path", ""))}
+            return all(name in folders for name in self.folder_names)
+        return True
+
+    def fetch(self, max_rows=REPORT_FETCH_ROWS, max_bytes=REPORT_FETCH_BYTES):
+        """Indexes up to max_rows more matching entries, reading at most max_bytes; returns how many."""
+        self._file.seek(self._scanned)
+        added = 0
+        end = self._scanned + max_bytes
+        while added < max_rows and self._scanned < end:
+            line = self._file.readline()
+            if not line.endswith(b"\n"):
+                self.at_end = True # End of file, or a partial line the writer hasn't finished
+                self._end_size = os.fstat(self._file.fileno()).st_size
+                break
+            offset = self._scanned
+            self._scanned += len(line)
+            if self._filtered:
+                if self._status_needle is not None and self._status_needle not in line:
+                    continue
+                if self._name_needles:
+                    lowered = line.lower()
+                    if not all(needle in lowered for needle in self._name_needles):
+                        continue
+                try:
+                    if not self._matches(json.loads(line)):
+                        continue
+                except ValueError:
+                    continue
+            self._offsets.append(offset)
+            added += 1
+        return added
+
+    def poll(self):
+        """Clears at_end if the file grew since the end was reached; returns whether fetch() may find more."""
+        if self.at_end and os.fstat(self._file.fileno()).st_size > self._end_size:
+            self.at_end = False
+        return not self.at_end
+
+    def row(self, index):
+        """Returns the entry at index (0 <= index < len(self)) as a dict."""
+        entry = self._cache.get(index)
+        if entry is None:
+            if len(self._cache) >= REPORT_ROW_CACHE:
+                self._cache.clear()
+            self._file.seek(self._offsets[index])
+            entry = self._cache[index] = json.loads(self._file.readline())
+        return entry
+
+    def close(self):
+        self._file.close()
+
+# --- Move Journal and Restore ---
+JOURNAL_PREFIX = "restore_journal_" # Journals are _Obsolete/restore_journal_<run id>.jsonl
+RESTORE_REPORT_NAME = "restored_folders_report"
+
+def _relative_to(path, prefix):
+    return path[len(prefix):] if path.startswith(prefix) else os.path.relpath(path, prefix)
+
+class MoveJournal:
+    """Appends one JSON line per completed move to _Obsolete/restore_journal_<run id>.jsonl.
+
+    Each line holds the run id, the time, the source and destination relative to the cleaned
+    folder and the destination's identity right after the move (inode and mtime on disk), so
+    restore_obsolete_moves puts back only the folder this run moved.
+    Flushed like the reports, so a killed run still leaves a usable journal. With a RunMetrics
+    its size is counted as bytes written.
+    """
+
+    def __init__(self, obsolete_dir, run_id=None, metrics=None):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.path = os.path.join(obsolete_dir, f"{JOURNAL_PREFIX}{self.run_id}.jsonl")
+        self.count = 0
+        self.metrics = metrics
+        self._base_prefix = os.path.join(os.path.dirname(obsolete_dir), "")
+        self._file = open(self.path, 'w', buffering=REPORT_BUFFER_SIZE, encoding='utf-8')
+        self._last_flush = time.monotonic()
+
+    def record(self, source, dest, identity=None):
+        entry = {"run": self.run_id, "time": round(time.time(), 3),
+                 "source": _relative_to(source, self._base_prefix), "dest": _relative_to(dest, self._base_prefix)}
+        if identity is not None:
+            entry["identity"] = identity
+        self._file.write(json.dumps(entry) + "\n")
+        self.count += 1
+        now = time.monotonic()
+        if now - self._last_flush >= REPORT_FLUSH_INTERVAL:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self):
+        self._file.close()
+        if self.metrics is not None:
+            self.metrics.add_bytes(os.path.getsize(self.path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def find_move_journals(path_to_clean):
+    """Returns the move journals of earlier cleanups of path_to_clean, newest first."""
+    obsolete_dir = os.path.join(path_to_clean, OBSOLETE_DIR_NAME)
+    try:
+        names = [entry.name for entry in os.scandir(obsolete_dir)
+                 if entry.name.startswith(JOURNAL_PREFIX) and entry.name.endswith(".jsonl") and entry.is_file()]
+    except OSError:
+        return []
+    return [os.path.join(obsolete_dir, name) for name in sorted(names, reverse=True)]
+
+def _journaled_destinations(path_to_clean):
+    """Returns the normcased absolute destinations listed by every readable journal of path_to_clean."""
+    destinations = set()
+    for journal_path in find_move_journals(path_to_clean):
+        try:
+            destinations.update(os.path.normcase(os.path.join(path_to_clean, dest))
+                                for _, dest, _ in read_move_journal(journal_path))
+        except (OSError, ValueError):
+            continue
+    return destinations
+
+def read_move_journal(journal_path):
+    """Returns the journal's (source, dest, identity) entries in the order the moves happened.
+
+    identity is None for entries of journals written before it was recorded. A truncated last
+    line (a run killed mid-write) is ignored; any other bad line raises ValueError.
+    """
+    with open(journal_path, encoding='utf-8') as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    entries = []
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            entry = json.loads(line)
+            entries.append((entry["source"], entry["dest"], entry.get("identity")))
+        except (ValueError, KeyError, TypeError):
+            if line_number == len(lines):
+                break
+            raise ValueError(f"{journal_path}, line {line_number}: not a move journal entry")
+    return entries
+
+def _prune_empty_parents(folders, stop_dir, keep=frozenset()):
+    """Removes the folders and their now-empty parents, bottom-up, stopping at stop_dir or a normcased path in keep."""
+    removed = set()
+    for folder in sorted(set(folders), key=len, reverse=True):
+        while (folder != stop_dir and folder.startswith(stop_dir) and folder not in removed
+               and os.path.normcase(folder) not in keep):
+            try:
+                os.rmdir(folder)
+            except OSError:
+                break
+            removed.add(folder)
+            folder = os.path.dirname(folder)
+
+def restore_obsolete_moves(journal_path, progress_callback=None, should_stop=None):
+    """Moves the folders recorded in a move journal back to where they came from, newest first.
+
+    Each folder goes back with one rename. An entry whose original path exists again is a
+    conflict and stays in _Obsolete; one whose _Obsolete copy is gone is reported as missing,
+    so restoring the same journal twice is harmless. A destination whose identity no longer
+    matches the journal (replaced, or changed since the cleanup) is reported as changed and left
+    in place. _Obsolete parents left empty are removed, unless a journal lists them as destinations.
+    Raises ValueError for an unusable journal and returns a dict describing the run.
+    """
+    if not journal_path or not os.path.isfile(journal_path):
+        raise ValueError("Please select a valid restore journal.")
+    obsolete_dir = os.path.dirname(os.path.abspath(journal_path))
+    base = os.path.dirname(obsolete_dir)
+    entries = read_move_journal(journal_path)
+
+    started = time.perf_counter()
+    restored = conflicts = changed = missing = failed = 0
+    created_parents = set()
+    emptied_parents = []
+    text_path, _ = _report_paths(base, RESTORE_REPORT_NAME, False)
+    with ReportWriter(text_path, f"Restored Folders ({os.path.basename(journal_path)}):") as report:
+        for index, (source, dest, identity) in enumerate(reversed(entries)):
+            if should_stop is not None and should_stop():
+                break
+            source_path = os.path.join(base, source)
+            dest_path = os.path.join(base, dest)
+            try:
+                if not os.path.isdir(dest_path):
+                    missing += 1
+                    report.write(f"Missing: {dest_path}", source_path, "restore", "missing")
+                elif identity is not None and LOCAL_FILESYSTEM.identity(dest_path) != identity:
+                    changed += 1
+                    report.write(f"Changed: {dest_path} is not the folder this cleanup moved; left in place",
+                                 source_path, "restore", "changed")
+                elif os.path.lexists(source_path):
+                    conflicts += 1
+                    report.write(f"Conflict: {source_path} exists again; left {dest_path} in place",
+                                 source_path, "restore", "conflict")
+                else:
+                    source_parent = os.path.dirname(source_path)
+                    if source_parent not in created_parents:
+                        os.makedirs(source_parent, exist_ok=True)
+                        created_parents.add(source_parent)
+                    _move_folder(dest_path, source_path)
+                    restored += 1
+                    emptied_parents.append(os.path.dirname(dest_path))
+                    report.write(f"Restored: {dest_path} to {source_path}", source_path, "restore", "restored")
+            except Exception as e:
+                failed += 1
+                report.write(f"Failed to restore {source_path}: {e}", source_path, "restore", "failed", error=str(e))
+            _report_progress(progress_callback, "restore", index + 1, len(entries), started)
+    _prune_empty_parents(emptied_parents, obsolete_dir, _journaled_destinations(base))
+
+    done = restored + conflicts + changed + missing + failed
+    cancelled = done < len(entries)
+    summary = (f"{restored:,} folders restored, {conflicts:,} conflicts, {changed:,} changed, {missing:,} missing, "
+               f"{failed:,} failed")
+    if cancelled:
+        final_message = f"Restore was cancelled after {done:,} of {len(entries):,} entries: {summary}."
+    else:
+        final_message = f"Restore finished: {summary}. Report created:\n- {text_path}"
+    return {
+        "path": base,
+        "journal": journal_path,
+        "entries": len(entries),
+        "restored": restored,
+        "conflicts": conflicts,
+        "changed": changed,
+        "missing": missing,
+        "failed": failed,
+        "cancelled": cancelled,
+        "reports": [text_path],
+        "message": final_message,
+    }
+
+def _report_paths(path_to_clean, name, jsonl_report):
+    """Returns the (text, jsonl-or-None) paths of one cleanup report."""
+    return (os.path.join(path_to_clean, f"{name}.txt"),
+            os.path.join(path_to_clean, f"{name}.jsonl") if jsonl_report else None)
+
+def _usable_index(emptiness_index, path_to_clean):
+    """True if emptiness_index covers path_to_clean completely."""
+    return (emptiness_index is not None and not emptiness_index.overflowed
+            and os.path.abspath(emptiness_index.root) == os.path.abspath(path_to_clean))
+
+def process_empty_folder_deletion_logic(path_to_clean: str, progress_callback=None, should_stop=None, jsonl_report=False,
+                                        scan_workers=SCAN_WORKERS, use_scan_cache=False, force_rescan=False,
+                                        emptiness_index=None, metrics=None, filesystem=None):
+    """Moves every empty folder under path_to_clean into '_Obsolete' and streams the reports.
+
+    Contains no UI calls so it can run in a worker thread or headless. Raises ValueError for
+    an invalid path and returns a dict describing the run. With jsonl_report each text report
+    gets a machine-readable .jsonl twin, and every move is journaled for restore_obsolete_moves.
+    scan_workers sets the concurrent folder listings. With use_scan_cache unchanged folders are
+    not listed again (see ScanCache) and the cache is refreshed after a complete scan;
+    force_rescan lists everything and rebuilds it. A live EmptinessIndex of path_to_clean (from a
+    FolderWatcher) replaces the scan; its empty roots are listed again before moving (see
+    _recheck_empty_roots). With a RunMetrics the run is instrumented and its
+    summary is saved as cleanup_metrics.json next to the reports and returned under "metrics".
+    filesystem selects the backend for scanning and moving (see AsyncFileSystem); reports, journal
+    and scan cache are local files.
+    """
+    if not path_to_clean or not os.path.isdir(path_to_clean):
+        raise ValueError("Please enter a valid path to clean.")
+
+    obsolete_dir = os.path.join(path_to_clean, OBSOLETE_DIR_NAME)
+    os.makedirs(obsolete_dir, exist_ok=True)
+
+    empty_count = moved = failed = 0
+    report_files = []
+    journal_path = None
+
+    with _stage(metrics, "scan"):
+        if _usable_index(emptiness_index, path_to_clean):
+            scan_cache = None
+            # The index lags the disk by up to one poll interval: every root is listed again first
+            current_empty_folders = _recheck_empty_roots(emptiness_index.empty_roots(), filesystem)
+        else:
+            scan_cache = ScanCache(path_to_clean, force_rescan=force_rescan) if use_scan_cache or force_rescan else None
+            current_empty_folders = identify_empty_dirs(path_to_clean, progress_callback, should_stop,
+                                                        max_workers=scan_workers, scan_cache=scan_cache,
+                                                        metrics=metrics, filesystem=filesystem)
+            if scan_cache is not None and scan_cache.hits:
+                # A copy that keeps timestamps adds files without changing any mtime: confirm on disk
+                current_empty_folders = _recheck_empty_roots(current_empty_folders, filesystem)
+    cancelled = bool(should_stop is not None and should_stop())
+    if scan_cache is not None and not cancelled:
+        try:
+            scan_cache.save()
+        except (OSError, sqlite3.Error):
+            pass # The cache only saves time; the next scan simply lists everything again
+    if not cancelled and current_empty_folders:
+        empty_count = len(current_empty_folders)
+        empty_text_path, empty_jsonl_path = _report_paths(path_to_clean, 'empty_folders_report', jsonl_report)
+        with _stage(metrics, "report"), \
+                ReportWriter(empty_text_path, "Identified Empty Folders:", empty_jsonl_path, metrics) as empty_report:
+            for folder in current_empty_folders:
+                empty_report.write(folder, folder, "identify", "empty")
+
+        moved_text_path, moved_jsonl_path = _report_paths(path_to_clean, MOVED_REPORT_NAME, jsonl_report)
+        with _stage(metrics, "move"), \
+                ReportWriter(moved_text_path, "Moved Folders Details:", moved_jsonl_path, metrics) as moved_report, \
+                MoveJournal(obsolete_dir, metrics=metrics) as journal:
+            moved, failed = move_empty_dirs(current_empty_folders, obsolete_dir, progress_callback, should_stop,
+                                            moved_report, journal, metrics, filesystem)
+        cancelled = moved + failed < empty_count
+        journal_path = journal.path
+        report_files = empty_report.paths + moved_report.paths + [journal_path]
+
+    summary = None
+    if metrics is not None:
+        metrics_path = os.path.join(path_to_clean, METRICS_REPORT_NAME)
+        summary = metrics.finish(metrics_path, path=path_to_clean, empty_folders=empty_count, moved=moved,
+                                 failed=failed, cancelled=cancelled)
+        report_files.append(metrics_path)
+
+    if journal_path is not None:
+        report_list = "\n- ".join(report_files)
+        if cancelled:
+            final_message = (f"Empty folder deletion was cancelled after {moved + failed} of "
+                             f"{empty_count} folders. Reports created:\n- {report_list}")
+        else:
+            final_message = f"The script has finished execution. Reports created:\n- {report_list}"
+    elif cancelled:
+        final_message = "Empty folder deletion was cancelled before any folder was moved."
+    else:
+        final_message = "No empty folders are present in the specified directory."
+
+    return {
+        "path": path_to_clean,
+        "empty_folders": empty_count,
+        "moved": moved,
+        "failed": failed,
+        "cancelled": cancelled,
+        "cached_folders": scan_cache.hits if scan_cache is not None else 0,
+        "reports": report_files,
+        "journal": journal_path,
+        "metrics": summary,
+        "message": final_message,
+    }
+
+def preview_empty_folder_deletion(path_to_clean, progress_callback=None, should_stop=None, scan_workers=SCAN_WORKERS,
+                                  use_scan_cache=False, emptiness_index=None, filesystem=None):
+    """Dry run of process_empty_folder_deletion_logic: scans only, moves and writes nothing.
+
+    Returns the empty roots that would be moved, each with the number of folders in its subtree.
+    use_scan_cache reads an existing scan cache but never updates it; a live EmptinessIndex of
+    path_to_clean answers without scanning. filesystem selects the scan backend.
+    """
+    if not path_to_clean or not os.path.isdir(path_to_clean):
+        raise ValueError("Please enter a valid path to clean.")
+
+    folder_counts = {}
+    if _usable_index(emptiness_index, path_to_clean):
+        empty_roots = emptiness_index.empty_roots(folder_counts)
+    else:
+        empty_roots = identify_empty_dirs(path_to_clean, progress_callback, should_stop, folder_counts, scan_workers,
+                                          ScanCache(path_to_clean) if use_scan_cache else None, filesystem=filesystem)
+    total_folders = sum(folder_counts.values())
+    if empty_roots:
+        largest = sorted(empty_roots, key=folder_counts.get, reverse=True)[:DRY_RUN_LISTED_ROOTS]
+        final_message = (f"Dry run: {len(empty_roots):,} empty folders holding {total_folders:,} folders in total "
+                         f"would be moved to {OBSOLETE_DIR_NAME}. Largest:\n- "
+                         + "\n- ".join(f"{root} ({folder_counts[root]:,})" for root in largest))
+    else:
+        final_message = "No empty folders are present in the specified directory."
+    return {
+        "path": path_to_clean,
+        "empty_roots": len(empty_roots),
+        "folders": total_folders,
+        "cancelled": bool(should_stop is not None and should_stop()),
+        "roots": [{"path": root, "folders": folder_counts[root]} for root in empty_roots],
+        "message": final_message,
+    }
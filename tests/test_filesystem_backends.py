@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from james_core import (
+    OBSOLETE_DIR_NAME, AsyncFileSystem, MemoryFileSystem, build_folder_plan, create_folder_structure,
+    identify_empty_dirs, move_empty_dirs
+)
+
+PROJECT = os.path.abspath(os.path.join(os.sep, "share", "project"))
+OBSOLETE = os.path.join(PROJECT, OBSOLETE_DIR_NAME)
+
+
+class ListJournal:
+    def __init__(self):
+        self.entries = []
+
+    def record(self, source, dest, identity=None):
+        self.entries.append((source, dest))
+
+
+@pytest.fixture(params=["memory", "async"])
+def backend(request):
+    """(MemoryFileSystem, filesystem argument): the memory backend itself or an AsyncFileSystem over it."""
+    memory = MemoryFileSystem()
+    if request.param == "memory":
+        yield memory, memory
+    else:
+        with AsyncFileSystem(memory, max_in_flight=4) as async_filesystem:
+            yield memory, async_filesystem
+
+
+def test_create_builds_the_plan_without_touching_the_disk(tmp_path, backend):
+    memory, filesystem = backend
+    project = str(tmp_path / "project")
+    languages, methodologies = ["de-DE", "fr-FR"], ["Adapt", "Med_Devices"]
+
+    result = create_folder_structure(project, languages, methodologies, filesystem=filesystem)
+    again = create_folder_structure(project, languages, methodologies, filesystem=filesystem)
+
+    plan = build_folder_plan(languages, methodologies)
+    assert result["created"] == result["planned"] == len(plan)
+    assert again["created"] == 0
+    assert {os.path.join(project, path) for path in plan} <= set(memory.folders())
+    assert not os.path.exists(project)
+
+
+def test_scan_finds_the_collapsed_empty_roots(backend):
+    memory, filesystem = backend
+    for folder in ("a/b/c", "a/d", "e/f", "g"):
+        memory.makedirs(os.path.join(PROJECT, folder))
+    memory.add_file(os.path.join(PROJECT, "e", "document.docx"))
+
+    roots = identify_empty_dirs(PROJECT, filesystem=filesystem)
+    assert sorted(roots) == [os.path.join(PROJECT, folder) for folder in ("a", "e/f", "g")]
+
+
+def test_moves_never_nest_inside_an_earlier_cleanup(backend):
+    memory, filesystem = backend
+    memory.makedirs(os.path.join(OBSOLETE, "a", "first"))
+    memory.makedirs(os.path.join(PROJECT, "a", "second"))
+    journal = ListJournal()
+
+    assert move_empty_dirs([os.path.join(PROJECT, "a")], OBSOLETE, journal=journal, filesystem=filesystem) == (1, 0)
+    assert journal.entries == [(os.path.join(PROJECT, "a"), os.path.join(OBSOLETE, "a_2"))]
+    assert memory.subdirectory_names(os.path.join(OBSOLETE, "a")) == ["first"]
+    assert memory.subdirectory_names(os.path.join(OBSOLETE, "a_2")) == ["second"]
+
+
+def test_cancelled_moves_are_all_journaled(backend):
+    memory, filesystem = backend
+    folders = [os.path.join(PROJECT, f"folder{index:03d}") for index in range(100)]
+    for folder in folders:
+        memory.makedirs(folder)
+    memory.makedirs(OBSOLETE)
+    journal = ListJournal()
+    checks = []
+
+    def should_stop():
+        checks.append(None)
+        return len(checks) > 3
+
+    moved, failed = move_empty_dirs(folders, OBSOLETE, should_stop=should_stop, journal=journal, filesystem=filesystem)
+    assert failed == 0 and 0 < moved < len(folders)
+    assert len(journal.entries) == moved == len(memory.subdirectory_names(OBSOLETE))
+
+
+def test_move_progress_is_rate_limited(backend):
+    memory, filesystem = backend
+    folders = [os.path.join(PROJECT, f"folder{index:04d}") for index in range(2000)]
+    for folder in folders:
+        memory.makedirs(folder)
+    updates = []
+
+    def progress(stage, done, total, rate):
+        updates.append((stage, done, total))
+
+    assert move_empty_dirs(folders, OBSOLETE, progress_callback=progress, filesystem=filesystem) == (2000, 0)
+    assert len(updates) < 100
+    assert updates[0] == ("move", 0, 2000) and updates[-1] == ("move", 2000, 2000)
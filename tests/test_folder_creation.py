@@ -0,0 +1,62 @@
+import json
+import os
+
+import pytest
+
+import james_core
+from james_core import (
+    CREATION_STATE_NAME, create_folder_structure, load_manifest, plan_creation_units, read_creation_state
+)
+
+LANGUAGES, METHODOLOGIES = ["de-DE", "fr-FR"], ["Adapt"]
+
+
+def test_a_second_run_on_the_same_project_is_refused(tmp_path):
+    project = str(tmp_path / "project")
+    calls = []
+
+    def progress(done):
+        if not calls:
+            calls.append(None)
+            with pytest.raises(ValueError, match="already working"):
+                create_folder_structure(project, LANGUAGES, METHODOLOGIES)
+
+    result = create_folder_structure(project, LANGUAGES, METHODOLOGIES, progress_callback=progress)
+    assert calls and result["created"] == result["planned"]
+    assert not os.path.exists(os.path.join(project, CREATION_STATE_NAME))
+
+
+def test_a_failed_run_keeps_its_checkpoint_for_resume(tmp_path, monkeypatch):
+    project = str(tmp_path / "project")
+    real_mkdir = james_core._make_planned_directory
+    calls = []
+
+    def failing_mkdir(*args, **kwargs):
+        calls.append(None)
+        if len(calls) > 30:
+            raise OSError("disk went away")
+        return real_mkdir(*args, **kwargs)
+
+    monkeypatch.setattr(james_core, "_make_planned_directory", failing_mkdir)
+    with pytest.raises(OSError):
+        create_folder_structure(project, LANGUAGES, METHODOLOGIES, max_workers=1)
+    state = read_creation_state(project)
+    assert state is not None and state["languages"] == LANGUAGES and state["completed"]
+    units = dict(plan_creation_units(LANGUAGES, METHODOLOGIES, state["date_code"]))
+    for unit in state["completed"]:
+        assert all(os.path.isdir(os.path.join(project, path)) for path in units[unit])
+
+    monkeypatch.setattr(james_core, "_make_planned_directory", real_mkdir)
+    result = create_folder_structure(project, LANGUAGES, METHODOLOGIES)
+    assert result["resumed"] and read_creation_state(project) is None
+
+
+def test_manifest_rejects_a_repeated_project(tmp_path):
+    manifest = tmp_path / "projects.json"
+    rows = [{"path": str(tmp_path / "a"), "languages": "de-DE", "methodologies": "Adapt"},
+            {"path": str(tmp_path / "b"), "languages": "fr-FR", "methodologies": "Adapt"},
+            {"path": str(tmp_path / "a" / "."), "languages": "it-IT", "methodologies": "Adapt"}]
+    manifest.write_text(json.dumps(rows), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="row 3.*already row 1"):
+        load_manifest(str(manifest))
@@ -0,0 +1,15 @@
+from james_core import dedupe_languages
+
+
+def test_dedupe_keeps_the_first_spelling():
+    assert dedupe_languages(["enIN", "en-IN", "English (India)", "French(France)", "fr_FR"]) == \
+        ["enIN", "French(France)"]
+
+
+def test_dedupe_keeps_script_subtags_apart():
+    assert dedupe_languages(["sr-Latn-RS", "sr-Cyrl-RS", "sr_latn_rs", "zh-Hans-CN", "zh-CN"]) == \
+        ["sr-Latn-RS", "sr-Cyrl-RS", "zh-Hans-CN", "zh-CN"]
+
+
+def test_dedupe_unknown_entries_ignoring_case():
+    assert dedupe_languages([" Klingon", "KLINGON", "de-DE"]) == ["Klingon", "de-DE"]
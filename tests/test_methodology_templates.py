@@ -0,0 +1,28 @@
+import json
+import os
+
+import pytest
+
+from james_core import (
+    METHODOLOGY_LAYOUTS, compile_layout, load_methodology_templates, methodology_name, methodology_names
+)
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    yield directory
+    load_methodology_templates(cache_path=str(tmp_path / "default_cache.json"))
+
+
+def test_template_replacing_a_builtin_keeps_its_spelling_and_place(tmp_path, template_dir):
+    (template_dir / "adapt.json").write_text(json.dumps({"target": {"01_Adapt": ["01_toLing"]}}))
+    (template_dir / "Client_X.json").write_text(json.dumps({"layout": {"Delivery": {}}}))
+
+    assert load_methodology_templates([str(template_dir)], str(tmp_path / "cache.json")) == []
+    assert methodology_names() == list(METHODOLOGY_LAYOUTS) + ["Client_X"]
+    assert methodology_name("ADAPT") == "Adapt"
+    static_paths, language_templates = compile_layout("Adapt")
+    assert os.path.join("Work", "06_Target", "{language}", "Adapt", "01_Adapt", "01_toLing") in language_templates
+    assert not any("adapt" in path.split(os.sep) for path in static_paths + language_templates)
@@ -0,0 +1,110 @@
+import os
+
+from james_core import (
+    OBSOLETE_DIR_NAME, MoveJournal, process_empty_folder_deletion_logic, read_move_journal, restore_obsolete_moves
+)
+
+
+def clean(project):
+    result = process_empty_folder_deletion_logic(str(project))
+    assert result["failed"] == 0
+    return result["journal"]
+
+
+def test_repeated_clean_keeps_earlier_moves_apart(tmp_path):
+    (tmp_path / "a" / "first").mkdir(parents=True)
+    first_journal = clean(tmp_path)
+    (tmp_path / "a" / "second").mkdir(parents=True)
+    second_journal = clean(tmp_path)
+
+    obsolete = tmp_path / OBSOLETE_DIR_NAME
+    assert sorted(os.listdir(obsolete / "a")) == ["first"]
+    assert sorted(os.listdir(obsolete / "a_2")) == ["second"]
+    assert [entry[:2] for entry in read_move_journal(first_journal)] == [("a", os.path.join(OBSOLETE_DIR_NAME, "a"))]
+    second_entries = read_move_journal(second_journal)
+    assert [entry[:2] for entry in second_entries] == [("a", os.path.join(OBSOLETE_DIR_NAME, "a_2"))]
+
+
+def test_restore_after_repeated_clean_restores_only_its_run(tmp_path):
+    (tmp_path / "a" / "first").mkdir(parents=True)
+    first_journal = clean(tmp_path)
+    (tmp_path / "a" / "second").mkdir(parents=True)
+    second_journal = clean(tmp_path)
+
+    result = restore_obsolete_moves(second_journal)
+    assert (result["restored"], result["changed"], result["conflicts"]) == (1, 0, 0)
+    assert sorted(os.listdir(tmp_path / "a")) == ["second"]
+    assert sorted(os.listdir(tmp_path / OBSOLETE_DIR_NAME / "a")) == ["first"]
+
+    # The first cleanup's folder cannot go back while a exists again
+    result = restore_obsolete_moves(first_journal)
+    assert (result["restored"], result["conflicts"]) == (0, 1)
+    assert (tmp_path / OBSOLETE_DIR_NAME / "a" / "first").is_dir()
+
+
+def test_restore_leaves_a_replaced_destination_in_place(tmp_path):
+    (tmp_path / "a" / "first").mkdir(parents=True)
+    journal = clean(tmp_path)
+    obsolete = tmp_path / OBSOLETE_DIR_NAME
+    (obsolete / "a").rename(obsolete / "elsewhere")
+    (obsolete / "a" / "other").mkdir(parents=True)
+
+    result = restore_obsolete_moves(journal)
+    assert (result["restored"], result["changed"]) == (0, 1)
+    assert not (tmp_path / "a").exists()
+    assert (obsolete / "a" / "other").is_dir()
+
+
+def test_restore_twice_reports_missing(tmp_path):
+    (tmp_path / "a" / "first").mkdir(parents=True)
+    (tmp_path / "b").mkdir()
+    journal = clean(tmp_path)
+
+    assert restore_obsolete_moves(journal)["restored"] == 2
+    result = restore_obsolete_moves(journal)
+    assert (result["restored"], result["missing"]) == (0, 2)
+    assert (tmp_path / "a" / "first").is_dir() and (tmp_path / "b").is_dir()
+
+
+def test_repeated_clean_never_moves_into_an_earlier_destination(tmp_path):
+    (tmp_path / "A").mkdir()
+    clean(tmp_path)
+    (tmp_path / "A" / "B").mkdir(parents=True)
+    (tmp_path / "A" / "keep.txt").write_text("content")
+    second_journal = clean(tmp_path)
+
+    obsolete = tmp_path / OBSOLETE_DIR_NAME
+    assert os.listdir(obsolete / "A") == []
+    assert [entry[:2] for entry in read_move_journal(second_journal)] == \
+        [(os.path.join("A", "B"), os.path.join(OBSOLETE_DIR_NAME, "A_2", "B"))]
+
+
+def test_restore_older_run_after_newer_run_under_its_name(tmp_path):
+    (tmp_path / "A").mkdir()
+    first_journal = clean(tmp_path)
+    (tmp_path / "A" / "B").mkdir(parents=True)
+    (tmp_path / "A" / "keep.txt").write_text("content")
+    second_journal = clean(tmp_path)
+
+    assert restore_obsolete_moves(second_journal)["restored"] == 1
+    assert (tmp_path / OBSOLETE_DIR_NAME / "A").is_dir()
+    (tmp_path / "A" / "keep.txt").unlink()
+    (tmp_path / "A" / "B").rmdir()
+    (tmp_path / "A").rmdir()
+    result = restore_obsolete_moves(first_journal)
+    assert (result["restored"], result["missing"], result["changed"]) == (1, 0, 0)
+    assert (tmp_path / "A").is_dir()
+
+
+def test_restore_never_prunes_an_earlier_destination(tmp_path):
+    # A journal written before moves were kept out of earlier destinations: B went inside run 1's A
+    (tmp_path / "A").mkdir()
+    clean(tmp_path)
+    obsolete = tmp_path / OBSOLETE_DIR_NAME
+    (obsolete / "A" / "B").mkdir()
+    with MoveJournal(str(obsolete), run_id="99999999_nested") as journal:
+        journal.record(str(tmp_path / "A" / "B"), str(obsolete / "A" / "B"))
+
+    assert restore_obsolete_moves(journal.path)["restored"] == 1
+    assert (tmp_path / "A" / "B").is_dir()
+    assert (obsolete / "A").is_dir()
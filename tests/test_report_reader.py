@@ -0,0 +1,39 @@
+import json
+
+from james_core import ReportReader
+
+
+def write_entries(report, *entries):
+    report.write("".join(json.dumps(entry) + "\n" for entry in entries))
+    report.flush()
+
+
+def test_reader_picks_up_entries_appended_after_the_end(tmp_path):
+    report_path = tmp_path / "moved_folders_report.jsonl"
+    with open(report_path, "w") as report:
+        write_entries(report, {"path": "/p/a", "status": "moved"})
+        report.write('{"path": "/p/b", "sta')
+        report.flush()
+        reader = ReportReader(str(report_path))
+        assert reader.fetch() == 1 and reader.at_end
+        assert not reader.poll()
+
+        report.write('tus": "failed"}\n')
+        report.flush()
+        assert reader.poll()
+        assert reader.fetch() == 1
+        assert reader.row(1) == {"path": "/p/b", "status": "failed"}
+    reader.close()
+
+
+def test_reader_filters_by_status_and_folder(tmp_path):
+    report_path = tmp_path / "moved_folders_report.jsonl"
+    with open(report_path, "w") as report:
+        write_entries(report,
+                      {"path": "/p/Work/06_Target/de-DE/FLV/01", "status": "moved"},
+                      {"path": "/p/Work/06_Target/de-DE/FLV/02", "status": "failed"},
+                      {"path": "/p/Work/06_Target/fr-FR/FLV/02", "status": "failed"})
+    reader = ReportReader(str(report_path), status="failed", language="DE-de")
+    reader.fetch()
+    assert [reader.row(index)["path"] for index in range(len(reader))] == ["/p/Work/06_Target/de-DE/FLV/02"]
+    reader.close()
@@ -0,0 +1,58 @@
+import os
+
+from james_core import OBSOLETE_DIR_NAME, ScanCache, identify_empty_dirs, process_empty_folder_deletion_logic
+
+OLD_MTIME = 1_600_000_000 # Older than SCAN_CACHE_MTIME_SLACK, so every folder is cached
+
+
+def age(root):
+    """Sets every folder's mtime to OLD_MTIME, deepest first."""
+    for dirpath, _, _ in sorted(os.walk(root), key=lambda walked: len(walked[0]), reverse=True):
+        os.utime(dirpath, (OLD_MTIME, OLD_MTIME))
+
+
+def build_cache(root):
+    age(root)
+    cache = ScanCache(str(root))
+    roots = identify_empty_dirs(str(root), scan_cache=cache)
+    cache.save()
+    return roots
+
+
+def test_stale_empty_verdict_never_moves_new_files(tmp_path):
+    (tmp_path / "A" / "B").mkdir(parents=True)
+    assert build_cache(tmp_path) == [str(tmp_path / "A")]
+
+    # Copied in with its timestamps kept (rsync -a, robocopy /DCOPY:T): no folder mtime changes
+    (tmp_path / "A" / "B" / "important.docx").write_text("content")
+    age(tmp_path)
+    result = process_empty_folder_deletion_logic(str(tmp_path), use_scan_cache=True)
+
+    assert result["cached_folders"] > 0 and result["moved"] == 0
+    assert (tmp_path / "A" / "B" / "important.docx").is_file()
+    assert not (tmp_path / OBSOLETE_DIR_NAME / "A").exists()
+
+
+def test_deleted_folder_invalidates_its_parent(tmp_path):
+    (tmp_path / "A" / "B" / "C").mkdir(parents=True)
+    (tmp_path / "A" / "B" / "C" / "file.txt").write_text("content")
+    assert build_cache(tmp_path) == []
+
+    (tmp_path / "A" / "B" / "C" / "file.txt").unlink()
+    (tmp_path / "A" / "B" / "C").rmdir()
+    cache = ScanCache(str(tmp_path))
+    assert identify_empty_dirs(str(tmp_path), scan_cache=cache) == [str(tmp_path / "A")]
+    assert cache.hits == 1 # A is unchanged; B lost C and the root gained _Obsolete, so both are listed
+
+
+def test_rescan_ignores_the_cache(tmp_path):
+    (tmp_path / "A" / "B").mkdir(parents=True)
+    build_cache(tmp_path)
+    (tmp_path / "A" / "B" / "important.docx").write_text("content")
+    age(tmp_path)
+
+    cache = ScanCache(str(tmp_path), force_rescan=True)
+    assert identify_empty_dirs(str(tmp_path), scan_cache=cache) == []
+    assert cache.hits == 0
+    result = process_empty_folder_deletion_logic(str(tmp_path), force_rescan=True)
+    assert (result["cached_folders"], result["moved"]) == (0, 0)
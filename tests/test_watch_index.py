@@ -0,0 +1,19 @@
+from james_core import OBSOLETE_DIR_NAME, EmptinessIndex, process_empty_folder_deletion_logic
+
+
+def test_cleanup_from_a_stale_index_keeps_new_content(tmp_path):
+    for folder in ("delivery/01_toLing", "delivery/02_fromLing", "old"):
+        (tmp_path / folder).mkdir(parents=True)
+    index = EmptinessIndex(str(tmp_path))
+    index.build()
+    assert sorted(index.empty_roots()) == [str(tmp_path / "delivery"), str(tmp_path / "old")]
+
+    # Arrives between two polls, so the index still lists delivery as empty
+    (tmp_path / "delivery" / "02_fromLing" / "delivery.docx").write_text("translated")
+    result = process_empty_folder_deletion_logic(str(tmp_path), emptiness_index=index)
+
+    assert (tmp_path / "delivery" / "02_fromLing" / "delivery.docx").is_file()
+    assert not (tmp_path / "delivery" / "01_toLing").exists()
+    assert (tmp_path / OBSOLETE_DIR_NAME / "delivery" / "01_toLing").is_dir()
+    assert (tmp_path / OBSOLETE_DIR_NAME / "old").is_dir()
+    assert result["moved"] == 2